@@ -0,0 +1,2 @@
+# 서울시민 카드 소비 분석 공용 모듈
+# app.py, seoul_card_consumption_analysis.py, seoul_card_consumption_dashboard.py 에서 함께 사용한다.
@@ -0,0 +1,226 @@
+import numpy as np
+import pandas as pd
+
+from seoul_card.date_features import MONTH_FEATURES, month_features
+
+# 큐브 차원 (기준월 × 온라인업종 × 고객행정동코드 × 연령대 × 성별)
+CUBE_DIMS = ['기준월', '온라인업종', '고객행정동코드', '연령대', '성별']
+
+# 합계 측정값, '레코드수'는 빈 셀 구분과 평균 계산용
+MEASURES = ['카드이용금액계', '카드이용건수']
+ROW_COUNT = '레코드수'
+
+# 기준월에서 파생되는 시간 차원
+TIME_DIMS = MONTH_FEATURES
+
+
+def _dimension_labels(values):
+    # 범주형이면 스키마의 고정 범주 순서, 아니면 정렬된 고유값
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return list(values.cat.categories)
+    return sorted(pd.unique(values))
+
+
+def _dimension_codes(values, labels):
+    # 범주 순서가 같으면 기존 코드를 그대로 쓰고, 아니면 라벨 순서로 재인코딩
+    if isinstance(values.dtype, pd.CategoricalDtype) and list(values.cat.categories) == list(labels):
+        return values.cat.codes.to_numpy()
+    return pd.Categorical(values, categories=labels).codes
+
+
+class AggregateCube:
+    # 원본 데이터를 한 번만 훑어 모든 차원 조합의 합계를 밀집 배열로 보관한다.
+    # 탭별 groupby는 필요 없는 축을 합산하는 롤업으로 대체된다.
+
+    def __init__(self, labels, measures):
+        self.labels = {dim: list(labels[dim]) for dim in CUBE_DIMS}
+        self.measures = measures
+
+    @property
+    def shape(self):
+        return tuple(len(self.labels[dim]) for dim in CUBE_DIMS)
+
+    @classmethod
+    def from_frame(cls, df, labels=None):
+        labels = dict(labels or {})
+        for dim in CUBE_DIMS:
+            if dim not in labels:
+                labels[dim] = _dimension_labels(df[dim])
+
+        shape = tuple(len(labels[dim]) for dim in CUBE_DIMS)
+        codes = [_dimension_codes(df[dim], labels[dim]) for dim in CUBE_DIMS]
+        valid = np.logical_and.reduce([c >= 0 for c in codes])
+        if not valid.all():
+            codes = [c[valid] for c in codes]
+        flat = np.ravel_multi_index(codes, shape)
+        size = int(np.prod(shape))
+
+        measures = {}
+        for measure in MEASURES:
+            values = df[measure].to_numpy()
+            if not valid.all():
+                values = values[valid]
+            measures[measure] = np.bincount(flat, weights=values, minlength=size).round().astype(np.int64).reshape(shape)
+        measures[ROW_COUNT] = np.bincount(flat, minlength=size).astype(np.int64).reshape(shape)
+        return cls(labels, measures)
+
+    @classmethod
+    def empty(cls):
+        labels = {dim: [] for dim in CUBE_DIMS}
+        shape = (0,) * len(CUBE_DIMS)
+        return cls(labels, {name: np.zeros(shape, dtype=np.int64) for name in MEASURES + [ROW_COUNT]})
+
+    @classmethod
+    def merge(cls, cubes):
+        # 부분 큐브(청크/파티션별)를 라벨 합집합 기준으로 더한다
+        cubes = list(cubes)
+        if not cubes:
+            raise ValueError('합칠 큐브가 없습니다.')
+        if len(cubes) == 1:
+            return cubes[0]
+
+        # 기준월 파티션 큐브처럼 나머지 라벨이 같고 기준월이 겹치지 않으면 기준월 축으로 이어 붙인다
+        other_dims = CUBE_DIMS[1:]
+        months = [m for cube in cubes for m in cube.months]
+        if len(set(months)) == len(months) and all(
+            cube.labels[dim] == cubes[0].labels[dim] for cube in cubes for dim in other_dims
+        ):
+            cubes = sorted(cubes, key=lambda cube: cube.months[0] if cube.months else '')
+            labels = {**cubes[0].labels, '기준월': [m for cube in cubes for m in cube.months]}
+            measures = {
+                name: np.concatenate([cube.measures[name] for cube in cubes], axis=0)
+                for name in cubes[0].measures
+            }
+            return cls(labels, measures)
+
+        labels = {}
+        for dim in CUBE_DIMS:
+            union = list(dict.fromkeys(label for cube in cubes for label in cube.labels[dim]))
+            labels[dim] = sorted(union) if dim == '기준월' else union
+        shape = tuple(len(labels[dim]) for dim in CUBE_DIMS)
+        positions = {dim: {label: i for i, label in enumerate(labels[dim])} for dim in CUBE_DIMS}
+
+        measures = {name: np.zeros(shape, dtype=np.int64) for name in cubes[0].measures}
+        for cube in cubes:
+            if cube.labels == labels:
+                for name, arr in cube.measures.items():
+                    measures[name] += arr
+                continue
+            index = np.ix_(*[[positions[dim][label] for label in cube.labels[dim]] for dim in CUBE_DIMS])
+            for name, arr in cube.measures.items():
+                measures[name][index] += arr
+        return cls(labels, measures)
+
+    @property
+    def months(self):
+        return self.labels['기준월']
+
+    @property
+    def years(self):
+        return sorted(set(month_features(self.months)['연도'].tolist()))
+
+    def select(self, years=None, months=None, **filters):
+        # 차원별 라벨 부분집합으로 자른 새 큐브 (연도/기준월 필터는 기준월 축 슬라이스)
+        if years is not None or months is not None:
+            month_labels = self.months
+            if years is not None:
+                keep = np.isin(month_features(month_labels)['연도'], list(years))
+                month_labels = [m for m, k in zip(month_labels, keep) if k]
+            if months is not None:
+                months = set(months)
+                month_labels = [m for m in month_labels if m in months]
+            filters = {**filters, '기준월': month_labels}
+        if not filters:
+            return self
+
+        labels = dict(self.labels)
+        measures = dict(self.measures)
+        for dim, wanted in filters.items():
+            axis = CUBE_DIMS.index(dim)
+            index = {label: i for i, label in enumerate(self.labels[dim])}
+            kept = [label for label in wanted if label in index]
+            positions = [index[label] for label in kept]
+            labels[dim] = kept
+            measures = {name: np.take(arr, positions, axis=axis) for name, arr in measures.items()}
+        return AggregateCube(labels, measures)
+
+    def regroup(self, dim, mapping, order=None):
+        # dim 축 라벨을 mapping(라벨 → 상위 라벨)으로 묶어 더한 새 큐브 (행정동 → 구 롤업 등).
+        # 상위 라벨 순서는 order(없으면 첫 등장 순서), mapping 에 없는 라벨은 그대로 둔다.
+        axis = CUBE_DIMS.index(dim)
+        parents = [mapping.get(label, label) for label in self.labels[dim]]
+        present = set(parents)
+        labels = [p for p in (order or []) if p in present]
+        labels += [p for p in dict.fromkeys(parents) if p not in set(labels)]
+        position = {label: i for i, label in enumerate(labels)}
+        indicator = np.zeros((len(labels), len(parents)), dtype=np.int64)
+        indicator[[position[p] for p in parents], np.arange(len(parents))] = 1
+        measures = {
+            name: np.moveaxis(np.tensordot(indicator, arr, axes=([1], [axis])), 0, axis)
+            for name, arr in self.measures.items()
+        }
+        return AggregateCube({**self.labels, dim: labels}, measures)
+
+    def dense(self, by, measure='카드이용금액계'):
+        # by 차원만 남긴 밀집 배열과 축별 라벨
+        by = list(by)
+        time_dims = [d for d in by if d in TIME_DIMS]
+        if time_dims and '기준월' in by:
+            raise ValueError('기준월과 파생 시간 차원(연도/월/분기)은 함께 롤업할 수 없습니다.')
+        unknown = [d for d in by if d not in CUBE_DIMS and d not in TIME_DIMS]
+        if unknown:
+            raise KeyError(f'알 수 없는 차원: {unknown}')
+
+        keep = [d for d in CUBE_DIMS if d in by or (d == '기준월' and time_dims)]
+        sum_axes = tuple(i for i, d in enumerate(CUBE_DIMS) if d not in keep)
+        arr = self.measures[measure].sum(axis=sum_axes)
+        axis_labels = {d: self.labels[d] for d in keep}
+
+        if time_dims:
+            # 기준월 축을 파생 시간 차원들의 곱 격자로 재배치
+            month_axis = keep.index('기준월')
+            features = month_features(self.months)
+            derived_labels, derived_codes = {}, []
+            for d in time_dims:
+                values, codes = np.unique(features[d], return_inverse=True)
+                derived_labels[d] = values.tolist()
+                derived_codes.append(codes.astype(np.intp))
+            grid_shape = tuple(len(derived_labels[d]) for d in time_dims)
+            target = np.ravel_multi_index(derived_codes, grid_shape) if self.months else np.array([], dtype=np.intp)
+            one_hot = np.zeros((len(self.months), int(np.prod(grid_shape))), dtype=arr.dtype)
+            one_hot[np.arange(len(self.months)), target] = 1
+            arr = np.moveaxis(arr, month_axis, -1) @ one_hot
+            arr = arr.reshape(arr.shape[:-1] + grid_shape)
+            keep = [d for d in keep if d != '기준월'] + time_dims
+            del axis_labels['기준월']
+            axis_labels.update(derived_labels)
+
+        arr = np.transpose(arr, [keep.index(d) for d in by])
+        return arr, [axis_labels[d] for d in by]
+
+    def series(self, by, measure='카드이용금액계', dropna=True):
+        # groupby(by)[measure].sum() 과 같은 형태의 Series
+        by = [by] if isinstance(by, str) else list(by)
+        values, axis_labels = self.dense(by, measure)
+        if len(by) == 1:
+            index = pd.Index(axis_labels[0], name=by[0])
+        else:
+            index = pd.MultiIndex.from_product(axis_labels, names=by)
+        result = pd.Series(values.ravel(), index=index, name=measure)
+        if dropna:
+            rows, _ = self.dense(by, ROW_COUNT)
+            result = result[rows.ravel() > 0]
+        return result
+
+    def rollup(self, by, measures='카드이용금액계', dropna=True):
+        # groupby(by)[measures].sum().reset_index() 과 같은 형태의 DataFrame
+        measures = [measures] if isinstance(measures, str) else list(measures)
+        frame = pd.concat([self.series(by, m, dropna=dropna) for m in measures], axis=1)
+        return frame.reset_index()
+
+    def values(self, dim):
+        # 데이터가 존재하는 라벨만 (정렬 순서 유지)
+        return list(self.series([dim], ROW_COUNT).index)
+
+    def total(self, measure='카드이용금액계'):
+        return int(self.measures[measure].sum())
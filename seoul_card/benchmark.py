@@ -0,0 +1,323 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from seoul_card.anomaly import GRANULARITIES
+from seoul_card.clustering import K_RANGE, ClusteringService, clustering_service, segment_features
+from seoul_card.dashboard_views import SEGMENT_ENTITIES, VIEWS
+from seoul_card.marketing_calendar import CalendarStore
+from seoul_card.partitions import MemoryPartitions
+from seoul_card.profiles import CategoryProfiles
+from seoul_card.regions import REGION_LEVELS, RegionRollups
+from seoul_card.sample_data import add_calendar_labels, generate_online_card_data, generate_transaction_data
+from seoul_card.shares import ShareShiftDetector
+
+# 헤드리스 벤치마크 (Streamlit 없이): 샘플 생성, 대시보드 화면 계산, 군집, PNG 리포트의 시간·메모리를 JSON 으로 남긴다.
+#   python -m seoul_card.benchmark --out bench.json
+#   python -m seoul_card.benchmark --out new.json --compare bench.json   (커밋 간 회귀 비교)
+
+SUITES = ['generate', 'dashboard', 'clustering', 'report']
+
+# 스키마 이름 → 샘플 생성 함수 (각 앱의 generate_sample_data 와 같은 데이터)
+SCHEMAS = {
+    'transaction': generate_transaction_data,  # seoul_card_consumption_analysis.py
+    'app': lambda n_samples, seed=None: add_calendar_labels(generate_transaction_data(n_samples, seed=seed)),  # app.py
+    'online': generate_online_card_data,  # seoul_card_consumption_dashboard.py
+}
+
+GENERATE_ROWS = [10_000, 100_000, 1_000_000, 10_000_000]
+DASHBOARD_ROWS = [100_000, 1_000_000]
+REPORT_ROWS = 50_000
+
+# 회귀로 표시하는 기준 (현재 / 기준 벽시계 시간 비율)
+REGRESSION_RATIO = 1.2
+
+# 대시보드 화면 인자 (기본 위젯 값). 현재 분기는 실행 날짜에 따라 바뀌지 않도록 고정
+TOP_N = 5
+N_CLUSTERS = 4
+NUM_DISPLAY = 10
+CURRENT_QUARTER = 1
+
+
+def _cpu_seconds():
+    # 이 프로세스 + 종료된 자식 프로세스(렌더링 작업 프로세스 등)의 CPU 시간
+    if resource is None:
+        return time.process_time()
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def _max_rss_bytes():
+    if resource is None:
+        return None
+    # Linux 는 KB, macOS 는 바이트 단위
+    scale = 1 if platform.system() == 'Darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def measure(func, setup=None, repeat=1):
+    # func(setup()) 을 repeat 번 실행한 벽시계/CPU 시간(최솟값·중앙값)과, 한 번 더 실행해 잰 tracemalloc 최대 할당량.
+    # setup 은 실행마다 새 입력을 만들며 측정에 포함되지 않는다 (캐시가 비어 있는 첫 계산을 잰다).
+    # 메모리 실행은 따로 하므로 tracemalloc 부하가 시간 측정에 섞이지 않는다
+    walls, cpus = [], []
+    for _ in range(repeat):
+        state = setup() if setup is not None else None
+        cpu = _cpu_seconds()
+        start = time.perf_counter()
+        func(state)
+        walls.append(time.perf_counter() - start)
+        cpus.append(_cpu_seconds() - cpu)
+        del state
+
+    state = setup() if setup is not None else None
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        func(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'wall_seconds': min(walls),
+        'wall_seconds_median': float(np.median(walls)),
+        'cpu_seconds': min(cpus),
+        'peak_alloc_bytes': peak - baseline,
+        'repeat': repeat,
+    }
+
+
+class BenchmarkRun:
+    # 측정 결과 레코드를 모으고 진행 상황을 한 줄씩 출력한다
+
+    def __init__(self, repeat=1, quiet=False):
+        self.repeat = repeat
+        self.quiet = quiet
+        self.results = []
+
+    def case(self, suite, name, func, rows=None, setup=None, **params):
+        record = {'suite': suite, 'name': name, 'rows': rows, 'params': params}
+        record.update(measure(func, setup, self.repeat))
+        self.results.append(record)
+        if not self.quiet:
+            print(f"{case_key(record):<72} {record['wall_seconds']:8.3f}s  cpu {record['cpu_seconds']:8.3f}s  "
+                  f"peak {record['peak_alloc_bytes'] / 2**20:9.1f}MB")
+        return record
+
+
+def run_generate(run, sizes=GENERATE_ROWS, seed=42):
+    for rows in sizes:
+        for schema, generate in SCHEMAS.items():
+            run.case('generate', schema, lambda _, generate=generate, rows=rows: generate(rows, seed=seed), rows=rows)
+
+
+def _dashboard_state(data):
+    # 대시보드 첫 방문과 같은 상태: 새 파티션 데이터셋 + 전체 연도 큐브 (파생 집계·군집 캐시는 비어 있음)
+    dataset = MemoryPartitions.from_frame(data)
+    cube = dataset.select(years=dataset.years).cube()
+    clustering_service.clear()
+    return dataset, cube
+
+
+def run_dashboard(run, sizes=DASHBOARD_ROWS, seed=42):
+    # 대시보드 다섯 화면의 계산 (dashboard_views.VIEWS 와 대시보드가 쓰는 파생 집계, 차트 그리기 제외)
+    for rows in sizes:
+        data = generate_online_card_data(rows, seed=seed)
+        state = lambda: _dashboard_state(data)
+        dataset, cube = state()
+        year = cube.years[-1]
+        months = cube.select(years=[year]).months
+
+        run.case('dashboard', 'partitions', lambda _: MemoryPartitions.from_frame(data), rows=rows)
+        run.case('dashboard', 'cube', lambda s: s.select(years=s.years).cube(), rows=rows,
+                 setup=lambda: MemoryPartitions.from_frame(data))
+
+        # 탭1: 월별 업종 소비 추이
+        run.case('dashboard', 'tab1_trend', lambda s: VIEWS['trend'](s[1], year=year, top_n=TOP_N), rows=rows,
+                 setup=state, year=year, top_n=TOP_N)
+
+        # 탭2: 지역 단위 롤업 + 단위별 지역 화면과 첫 지역 상세
+        def tab2(s):
+            rollups = RegionRollups(s[1])
+            for level in REGION_LEVELS:
+                region_cube = rollups[level]
+                VIEWS['region'](region_cube, unit=level)
+                VIEWS['district'](region_cube, district=region_cube.values('고객행정동코드')[0])
+
+        run.case('dashboard', 'tab2_region', tab2, rows=rows, setup=state, levels=REGION_LEVELS)
+
+        # 탭3: 업종 K-means (k 전체 학습 + 실루엣) 와 세그먼트 MiniBatchKMeans
+        run.case('dashboard', 'tab3_cluster', lambda s: VIEWS['cluster'](s[1], year=year, n_clusters=N_CLUSTERS),
+                 rows=rows, setup=state, year=year, n_clusters=N_CLUSTERS)
+        for entity in SEGMENT_ENTITIES:
+            run.case('dashboard', 'tab3_segment',
+                     lambda s, entity=entity: VIEWS['segment'](s[1], year=year, entity=entity, n_clusters=N_CLUSTERS),
+                     rows=rows, setup=state, year=year, entity=entity, n_clusters=N_CLUSTERS)
+
+        # 탭4: 비중 표·급증/급감 순위, 인사이트, 비중 이상치 알림
+        def tab4(s):
+            dataset, cube = s
+            detector = dataset.derived('share_shift', ShareShiftDetector.from_dataset)
+            share_shift = VIEWS['share_shift'](detector, months=months, n=NUM_DISPLAY)
+            VIEWS['share_shift_insight'](cube, top_increase=share_shift['top_increase'],
+                                         profiles=CategoryProfiles.from_cube(cube))
+            VIEWS['share_anomalies'](cube, granularities=list(GRANULARITIES), months=months, top_n=NUM_DISPLAY * 3)
+
+        run.case('dashboard', 'tab4_share_shift', tab4, rows=rows, setup=state, months=len(months), n=NUM_DISPLAY)
+
+        # 탭5: 추천과 마케팅 캘린더
+        def tab5(s):
+            dataset, cube = s
+            VIEWS['recommendation'](cube, current_quarter=CURRENT_QUARTER, profiles=CategoryProfiles.from_cube(cube))
+            dataset.derived('marketing_calendar', CalendarStore.from_dataset).get(cube.months).calendar_table()
+
+        run.case('dashboard', 'tab5_recommendation', tab5, rows=rows, setup=state, current_quarter=CURRENT_QUARTER)
+        del data, dataset, cube
+
+
+def run_clustering(run, sizes=DASHBOARD_ROWS, seed=42):
+    # K-means 학습과 실루엣 점수만 따로: 업종 × 월 피벗의 k 전체 학습, 행정동 세그먼트 MiniBatchKMeans
+    for rows in sizes:
+        dataset, cube = _dashboard_state(generate_online_card_data(rows, seed=seed))
+        year_cube = cube.select(years=[cube.years[-1]])
+        pivot = year_cube.series(['온라인업종', '월']).unstack('월').fillna(0)
+        run.case('clustering', 'kmeans_silhouette_sweep', lambda service: service.sweep(pivot, K_RANGE),
+                 rows=rows, setup=ClusteringService, ks=list(K_RANGE), shape=list(pivot.shape))
+        for entity, dims in SEGMENT_ENTITIES.items():
+            features, _ = segment_features(year_cube, dims)
+            run.case('clustering', 'segment_minibatch', lambda service: service.segment(features, N_CLUSTERS),
+                     rows=rows, setup=ClusteringService, entity=entity, shape=list(features.shape))
+        del dataset, cube
+
+
+def _silent(func, *args):
+    # 스크립트 콘솔 출력은 측정 결과 출력과 섞이지 않게 버린다
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+
+def run_report(run, rows=REPORT_ROWS, seed=42, workers=None):
+    # PNG 리포트: 샘플 생성, 집계, 렌더링 단계별 + 전체 (렌더링 작업 프로세스의 CPU 시간 포함)
+    import seoul_card_consumption_analysis as analysis
+
+    data = analysis.generate_sample_data(rows, seed=seed)
+    aggregates = analysis.compute_aggregates(data)
+    with tempfile.TemporaryDirectory() as out_dir:
+        run.case('report', 'aggregate', lambda _: analysis.compute_aggregates(data), rows=rows)
+        run.case('report', 'render', lambda _: analysis.render_report(aggregates, out_dir=out_dir, workers=workers,
+                                                                       force=True), rows=rows, workers=workers)
+        argv = ['--rows', str(rows), '--seed', str(seed), '--out-dir', out_dir, '--quiet', '--force']
+        if workers:
+            argv += ['--workers', str(workers)]
+        run.case('report', 'full', lambda _: _silent(analysis.main, argv), rows=rows, workers=workers)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        'commit': _git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+    }
+
+
+def case_key(record):
+    # 커밋 간 비교에 쓰는 측정 항목 식별자
+    params = ','.join(f'{k}={v}' for k, v in sorted(record['params'].items()))
+    return f"{record['suite']}/{record['name']}/{record['rows']}" + (f'/{params}' if params else '')
+
+
+def compare(baseline, current, threshold=REGRESSION_RATIO):
+    # 두 벤치마크 JSON 결과의 같은 항목끼리 벽시계 시간·최대 할당량 비율 (현재 / 기준)
+    base = {case_key(r): r for r in baseline['results']}
+    rows = []
+    for record in current['results']:
+        old = base.get(case_key(record))
+        if old is None:
+            continue
+        ratio = record['wall_seconds'] / old['wall_seconds'] if old['wall_seconds'] else np.nan
+        rows.append({
+            'case': case_key(record),
+            'base_seconds': old['wall_seconds'],
+            'seconds': record['wall_seconds'],
+            'ratio': ratio,
+            'memory_ratio': record['peak_alloc_bytes'] / old['peak_alloc_bytes'] if old['peak_alloc_bytes'] else np.nan,
+            'regression': bool(ratio > threshold),
+        })
+    return pd.DataFrame(rows, columns=['case', 'base_seconds', 'seconds', 'ratio', 'memory_ratio', 'regression'])
+
+
+def run_benchmarks(suites=SUITES, generate_rows=GENERATE_ROWS, dashboard_rows=DASHBOARD_ROWS, report_rows=REPORT_ROWS,
+                   report_workers=None, repeat=1, seed=42, quiet=False):
+    run = BenchmarkRun(repeat=repeat, quiet=quiet)
+    if 'generate' in suites:
+        run_generate(run, generate_rows, seed=seed)
+    if 'dashboard' in suites:
+        run_dashboard(run, dashboard_rows, seed=seed)
+    if 'clustering' in suites:
+        run_clustering(run, dashboard_rows, seed=seed)
+    if 'report' in suites:
+        run_report(run, report_rows, seed=seed, workers=report_workers)
+    meta = environment()
+    meta.update({'suites': list(suites), 'repeat': repeat, 'seed': seed, 'max_rss_bytes': _max_rss_bytes()})
+    return {'meta': meta, 'results': run.results}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='샘플 생성·대시보드 화면·군집·PNG 리포트 헤드리스 벤치마크 (JSON 저장)')
+    parser.add_argument('--out', default='benchmark.json', help='결과 JSON 파일 경로')
+    parser.add_argument('--suites', nargs='+', choices=SUITES, default=SUITES)
+    parser.add_argument('--generate-rows', type=int, nargs='+', default=GENERATE_ROWS)
+    parser.add_argument('--dashboard-rows', type=int, nargs='+', default=DASHBOARD_ROWS)
+    parser.add_argument('--report-rows', type=int, default=REPORT_ROWS)
+    parser.add_argument('--report-workers', type=int, default=None, help='리포트 렌더링 프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--repeat', type=int, default=1, help='항목별 시간 측정 반복 횟수 (최솟값 기록)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--compare', default=None, help='비교할 기준 결과 JSON (회귀 항목 표시)')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_RATIO, help='회귀로 볼 시간 비율')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.suites, args.generate_rows, args.dashboard_rows, args.report_rows,
+                            args.report_workers, args.repeat, args.seed)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f'결과 저장: {args.out} ({len(report["results"])}개 항목)')
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        table = compare(baseline, report, args.threshold)
+        print(f"\n기준 {baseline['meta'].get('commit')} → 현재 {report['meta'].get('commit')}")
+        print(table.to_string(index=False, float_format='{:.3f}'.format))
+        print(f"회귀 {int(table['regression'].sum())}개 (시간 비율 > {args.threshold})")
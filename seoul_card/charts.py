@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# 서버에서 미리 나누는 히스토그램 구간 수 (차트 전송량은 행 수가 아니라 이 값에 비례)
+HISTOGRAM_BINS = 50
+
+
+def _downcast_integers(values):
+    return pd.to_numeric(pd.Series(values.ravel()), downcast='integer').to_numpy().reshape(values.shape)
+
+
+def compact_array(values):
+    # 차트 전송용 배열: 값이 바뀌지 않는 범위에서만 원소당 바이트 수를 줄인다.
+    # plotly 는 numpy 배열을 base64 타입 배열로 직렬화하므로 원소당 바이트 수가 그대로 전송량이 된다
+    # - 정수: 값 범위에 맞는 가장 작은 정수형
+    # - 실수: float32 로 정확히 표현되면 float32, 정수값뿐이면(소비금액 합계 등) 정수형, 그 밖에는 float64 그대로
+    #   (float32 는 유효숫자가 7자리뿐이라 1e8 이상의 합계가 반올림되어 표·내보내기 값과 달라진다)
+    values = np.asarray(values)
+    if not values.size:
+        return values
+    if values.dtype.kind in 'iu':
+        return _downcast_integers(values)
+    if values.dtype.kind == 'f':
+        narrow = values.astype(np.float32)
+        if np.array_equal(narrow, values, equal_nan=True):
+            return narrow
+        if np.isfinite(values).all() and (values == np.round(values)).all() and np.abs(values).max() < 2**63:
+            return _downcast_integers(values.astype(np.int64))
+    return values
+
+
+def chart_frame(frame):
+    # 차트에 넘기는 표의 숫자 열만 compact_array 로 줄인 사본 (라벨·문자열 열은 그대로)
+    frame = frame.copy()
+    for name, dtype in frame.dtypes.items():
+        if pd.api.types.is_numeric_dtype(dtype):
+            frame[name] = compact_array(frame[name].to_numpy())
+    return frame
+
+
+def histogram_bins(values, bins=HISTOGRAM_BINS):
+    # np.histogram 으로 (구간 경계 [bins+1], 빈도 [bins]) 를 계산한다 (NaN 은 제외)
+    values = np.asarray(values, dtype=np.float64)
+    counts, edges = np.histogram(values[~np.isnan(values)], bins=bins)
+    return edges, counts
+
+
+def histogram_figure(values, bins=HISTOGRAM_BINS, title=None, x_label=None, y_label='count'):
+    # px.histogram(frame, x=...) 대신 서버에서 구간을 나눈 막대 차트.
+    # 브라우저로는 구간 중앙·폭·빈도 배열(각 bins 개)만 보내고 원본 값 열은 보내지 않는다
+    edges, counts = histogram_bins(values, bins)
+    fig = go.Figure(go.Bar(
+        x=compact_array((edges[:-1] + edges[1:]) / 2),
+        y=compact_array(counts),
+        width=compact_array(np.diff(edges)),
+        customdata=compact_array(np.column_stack([edges[:-1], edges[1:]])),
+        hovertemplate='%{customdata[0]:,.0f} ~ %{customdata[1]:,.0f}<br>' + f'{y_label}=%{{y:,}}<extra></extra>',
+    ))
+    fig.update_layout(title=title, bargap=0, xaxis_title=x_label, yaxis_title=y_label)
+    return fig
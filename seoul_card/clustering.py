@@ -0,0 +1,210 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+from seoul_card.instrumentation import span
+
+# 대시보드 군집 수 슬라이더 범위
+K_RANGE = range(2, 7)
+
+# 군집 캐시(표준화 배열 + 학습 결과) 전체 바이트 한도
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# 세그먼트 군집: 실루엣 점수 표본 크기 (O(n²) 거리 계산을 표본 크기로 제한) 와 미니배치 크기
+SILHOUETTE_SAMPLE = 2000
+BATCH_SIZE = 4096
+
+
+def pivot_hash(pivot):
+    # 피벗(행: 대상, 열: 특성)의 라벨과 값으로 만든 내용 해시 (같은 피벗이면 같은 키)
+    digest = hashlib.sha1()
+    digest.update(repr((list(pivot.index), list(pivot.columns))).encode('utf-8'))
+    digest.update(np.ascontiguousarray(pivot.to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+def segment_features(cube, entity_dims, feature_dim='온라인업종', measure='카드이용금액계'):
+    # 큐브에서 대상(행정동, 행정동×연령대×성별 등)별 업종 소비 구성비 행렬을 만든다.
+    # 원본 행을 다시 훑지 않고 롤업 한 번으로 끝나며, 소비가 없는 대상은 제외한다.
+    # (구성비 DataFrame, 대상별 총소비금액 Series) 를 돌려준다.
+    entity_dims = list(entity_dims)
+    values, labels = cube.dense(entity_dims + [feature_dim], measure)
+    matrix = values.reshape(-1, values.shape[-1]).astype(np.float64)
+    totals = matrix.sum(axis=1)
+    keep = totals > 0
+
+    if len(entity_dims) == 1:
+        index = pd.Index(labels[0], name=entity_dims[0])
+    else:
+        index = pd.MultiIndex.from_product(labels[:-1], names=entity_dims)
+    index = index[keep]
+    features = pd.DataFrame(matrix[keep] / totals[keep, None], index=index,
+                            columns=pd.Index(labels[-1], name=feature_dim))
+    return features, pd.Series(totals[keep], index=index, name='총소비금액')
+
+
+class ClusteringService:
+    # 표준화된 피벗과 K-means 학습 결과를 (피벗 내용 해시, k) 단위로 보관한다.
+    # 처음 보는 피벗은 k 전체(K_RANGE)를 스레드 풀에서 한 번에 학습해 두므로
+    # 군집 수를 바꾸는 것은 캐시 조회가 되고, k별 실루엣 점수와 추천 k도 함께 얻는다.
+    # 학습 설정(random_state=42, n_init=10)은 기존 탭3과 같아 결과도 같다.
+    # 두 캐시는 저장소별 항목 수와 합계 바이트(max_bytes) 한도를 넘으면 오래된 항목부터 제거한다.
+
+    def __init__(self, random_state=42, n_init=10, max_workers=None, max_entries=256, max_bytes=MAX_CACHE_BYTES):
+        self.random_state = random_state
+        self.n_init = n_init
+        self.max_workers = max_workers
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._scaled = OrderedDict()
+        self._fits = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _nbytes(value):
+        # 표준화 배열 또는 학습 결과(dict) 안의 배열 크기
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        return sum(v.nbytes for v in value.values() if isinstance(v, np.ndarray))
+
+    def _remember(self, store, key, value):
+        nbytes = self._nbytes(value)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in store:
+                self._bytes -= store.pop(key)[1]
+            store[key] = (value, nbytes)
+            self._bytes += nbytes
+            while len(store) > self.max_entries:
+                self._bytes -= store.popitem(last=False)[1][1]
+            # 바이트 한도는 두 저장소 합계: 넣은 저장소의 오래된 항목부터, 그래도 넘으면 다른 저장소에서 제거
+            for victims in (store, self._fits if store is self._scaled else self._scaled):
+                while self._bytes > self.max_bytes and victims:
+                    self._bytes -= victims.popitem(last=False)[1][1]
+
+    def _lookup(self, store, key):
+        with self._lock:
+            entry = store.get(key)
+            if entry is None:
+                return None
+            store.move_to_end(key)
+            return entry[0]
+
+    def prepare(self, pivot):
+        # (피벗 해시, 표준화 배열) - 표준화는 피벗마다 한 번만
+        key = pivot_hash(pivot)
+        scaled = self._lookup(self._scaled, key)
+        if scaled is None:
+            scaled = StandardScaler().fit_transform(pivot)
+            self._remember(self._scaled, key, scaled)
+        return key, scaled
+
+    def _fit(self, scaled, k):
+        kmeans = KMeans(n_clusters=k, random_state=self.random_state, n_init=self.n_init)
+        labels = kmeans.fit_predict(scaled)
+        # 실루엣 점수는 2 <= 군집 수 < 표본 수 일 때만 정의된다
+        silhouette = None
+        if 2 <= len(np.unique(labels)) < len(scaled):
+            silhouette = float(silhouette_score(scaled, labels))
+        return {
+            'k': k,
+            'labels': labels,
+            'centers': kmeans.cluster_centers_,
+            'inertia': float(kmeans.inertia_),
+            'silhouette': silhouette,
+        }
+
+    def sweep(self, pivot, ks=K_RANGE):
+        # 아직 학습하지 않은 k를 스레드 풀에서 함께 학습하고 {k: 결과} 를 돌려준다
+        key, scaled = self.prepare(pivot)
+        ks = [k for k in ks if 1 <= k <= len(scaled)]
+        results = {}
+        missing = []
+        for k in ks:
+            result = self._lookup(self._fits, (key, k))
+            if result is None:
+                missing.append(k)
+            else:
+                results[k] = result
+
+        if not missing:
+            return {k: results[k] for k in ks}
+        # K-means 학습 + 실루엣 점수 (계측 구간, 캐시에 없던 k 만)
+        with span('kmeans_silhouette', rows=len(scaled), ks=missing):
+            if len(missing) == 1:
+                fitted = [self._fit(scaled, missing[0])]
+            else:
+                workers = self.max_workers or min(len(missing), os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    fitted = list(executor.map(lambda k: self._fit(scaled, k), missing))
+        for k, result in zip(missing, fitted):
+            self._remember(self._fits, (key, k), result)
+            results[k] = result
+        return {k: results[k] for k in ks}
+
+    def fit(self, pivot, k, ks=K_RANGE):
+        # k 하나를 요청해도 처음 보는 피벗이면 ks 전체를 함께 학습해 둔다
+        if not 1 <= k <= len(pivot):
+            raise ValueError(f'군집 수 {k} 는 1 이상, 군집 대상 수({len(pivot)}) 이하여야 합니다')
+        sweep_ks = list(ks) if k in ks else [k]
+        return self.sweep(pivot, sweep_ks)[k]
+
+    def silhouette_scores(self, pivot, ks=K_RANGE):
+        return {k: result['silhouette'] for k, result in self.sweep(pivot, ks).items()}
+
+    def recommend_k(self, pivot, ks=K_RANGE):
+        # 실루엣 점수가 가장 높은 k (동점이면 작은 k), 계산할 수 없으면 None
+        scores = {k: s for k, s in self.silhouette_scores(pivot, ks).items() if s is not None}
+        if not scores:
+            return None
+        return max(scores, key=lambda k: (scores[k], -k))
+
+    def segment(self, features, k, sample_size=SILHOUETTE_SAMPLE, batch_size=BATCH_SIZE):
+        # 대상 수가 많은 세그먼트 군집: MiniBatchKMeans (미니배치 단위로 중심 갱신, 메모리 O(n·특성 수))
+        # 와 표본 실루엣 점수. 결과는 (특성 해시, k, 'segment') 로 캐시한다.
+        # 표준화한 특성 행렬은 대상 수에 비례해 커지므로 캐시하지 않고 학습 결과만 보관한다
+        cache_key = (pivot_hash(features), k, 'segment', sample_size)
+        result = self._lookup(self._fits, cache_key)
+        if result is not None:
+            return result
+
+        scaled = StandardScaler().fit_transform(features)
+        n_samples = len(scaled)
+        with span('minibatch_kmeans', rows=n_samples, k=k):
+            model = MiniBatchKMeans(n_clusters=k, random_state=self.random_state,
+                                    batch_size=min(batch_size, n_samples), n_init=3)
+            labels = model.fit_predict(scaled)
+            silhouette = None
+            if 2 <= len(np.unique(labels)) < n_samples:
+                sample = min(sample_size, n_samples)
+                silhouette = float(silhouette_score(scaled, labels, sample_size=sample, random_state=self.random_state))
+        result = {
+            'k': k,
+            'labels': labels,
+            'centers': model.cluster_centers_,
+            'inertia': float(model.inertia_),
+            'silhouette': silhouette,
+            'silhouette_sample': min(sample_size, n_samples),
+        }
+        self._remember(self._fits, cache_key, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._scaled.clear()
+            self._fits.clear()
+            self._bytes = 0
+
+
+# 프로세스 전체에서 공유하는 기본 군집 서비스 (Streamlit 재실행 간에도 유지됨)
+clustering_service = ClusteringService()
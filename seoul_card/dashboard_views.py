@@ -0,0 +1,303 @@
+import numpy as np
+import pandas as pd
+
+from seoul_card.anomaly import share_anomalies
+from seoul_card.clustering import K_RANGE, clustering_service, segment_features
+from seoul_card.date_features import month_features
+from seoul_card.growth import growth_table
+from seoul_card.insights import category_leaders
+from seoul_card.profiles import CategoryProfiles
+
+# 세그먼트 군집 대상 → 큐브 차원
+SEGMENT_ENTITIES = {
+    '행정동': ['고객행정동코드'],
+    '행정동 × 연령대 × 성별': ['고객행정동코드', '연령대', '성별'],
+}
+
+# 대시보드 화면별 계산 (Streamlit 없이도 호출 가능).
+# 각 함수는 집계 큐브와 화면 인자만 받아 표시할 데이터만 돌려주므로,
+# 대시보드는 (데이터셋 버전, 기준월, 화면 인자) 로 결과를 캐시하고 보이는 화면만 계산한다.
+
+
+def trend_view(cube, year, top_n):
+    # 탭1: 선택 연도의 월별 업종 추이, 상위 N개 업종, 연도별 추이, 성장률 인사이트
+    year_cube = cube.select(years=[year])
+    year_data = year_cube.rollup(['월', '온라인업종'])
+
+    # 상위 N개 업종 찾기
+    year_category = year_cube.series('온라인업종')
+    top_categories = year_category.nlargest(top_n).index.tolist()
+    year_data_top = year_data[year_data['온라인업종'].isin(top_categories)]
+
+    # 업종별 총 소비 금액
+    category_sum = year_category.sort_values(ascending=False).reset_index().head(top_n)
+
+    # 연도별 업종 소비 추이 (모든 연도)
+    yearly_sum = cube.rollup(['연도', '온라인업종'])
+    yearly_top = yearly_sum[yearly_sum['온라인업종'].isin(top_categories)]
+
+    # 성장률이 가장 높은 업종 (첫 달과 마지막 달 비교, 상위 업종 중 두 달 모두 데이터가 있는 업종)
+    growth_rates = growth_table(year_cube)['성장률'].reindex(top_categories).dropna()
+    fastest_growing = None
+    if len(growth_rates) > 0:
+        fastest = growth_rates.idxmax()
+        fastest_growing = {'업종': fastest, '성장률': growth_rates[fastest]}
+
+    return {
+        'year_data_top': year_data_top,
+        'category_sum': category_sum,
+        'yearly_top': yearly_top,
+        'fastest_growing': fastest_growing,
+    }
+
+
+def region_view(cube, unit='행정동'):
+    # 탭2 상단: 지역(행정동, 또는 RegionRollups 의 구/시 큐브)별 최다 소비 업종과 업종별 지역 수
+    district_sum = cube.rollup(['고객행정동코드', '온라인업종'])
+    top_category_by_district = district_sum.loc[district_sum.groupby('고객행정동코드')['카드이용금액계'].idxmax()]
+
+    district_cat_count = top_category_by_district['온라인업종'].value_counts().reset_index()
+    district_cat_count.columns = ['업종', f'{unit} 수']
+    return {'district_cat_count': district_cat_count}
+
+
+def district_view(cube, district):
+    # 탭2 하단: 선택한 행정동의 업종/연령대/성별 소비
+    district_cube = cube.select(고객행정동코드=[district])
+    district_category_sum = district_cube.series('온라인업종').sort_values(ascending=False).reset_index()
+    district_age_sum = district_cube.series('연령대').sort_values(ascending=False).reset_index()
+
+    # 성별 비율 계산
+    gender_pct = None
+    district_gender_sum = district_cube.rollup(['성별'])
+    if len(district_gender_sum) == 2:
+        male_amount = district_gender_sum[district_gender_sum['성별'] == '남성']['카드이용금액계'].values[0]
+        female_amount = district_gender_sum[district_gender_sum['성별'] == '여성']['카드이용금액계'].values[0]
+        total = male_amount + female_amount
+        gender_pct = {'남성': (male_amount / total) * 100, '여성': (female_amount / total) * 100}
+
+    return {
+        'category_sum': district_category_sum,
+        'age_sum': district_age_sum,
+        'gender_pct': gender_pct,
+    }
+
+
+def cluster_view(cube, year, n_clusters):
+    # 탭3: 업종 × 월 소비 패턴 K-means 군집과 군집별 특성
+    year_cube = cube.select(years=[year])
+
+    # 업종별 월간 소비 패턴 분석을 위한 피벗 테이블 생성
+    pivot_data = year_cube.series(['온라인업종', '월']).unstack('월').fillna(0)
+    # 업종 수가 군집 수보다 적으면 (소수 업종만 남은 연도/필터) 군집을 만들 수 없다
+    if len(pivot_data) < n_clusters:
+        return None
+
+    # 표준화 후 K-means 군집화 (피벗 내용 해시와 k로 캐시, 처음 보는 피벗이면 k=2..6을 함께 학습)
+    fitted = clustering_service.fit(pivot_data, n_clusters)
+    clusters = fitted['labels']
+
+    cluster_df = pd.DataFrame({
+        '업종': pivot_data.index,
+        '군집': clusters
+    })
+    cluster_counts = cluster_df['군집'].value_counts().reset_index()
+    cluster_counts.columns = ['군집', '업종 수']
+
+    details = [cluster_detail(year_cube, cluster_df[cluster_df['군집'] == i]) for i in range(n_clusters)]
+
+    # 실루엣 점수 (데이터 포인트 수가 군집 수보다 작으면 계산 불가)와 k별 점수, 추천 k
+    silhouette_scores = clustering_service.silhouette_scores(pivot_data, K_RANGE)
+
+    return {
+        'cluster_counts': cluster_counts,
+        'details': details,
+        'silhouette': fitted['silhouette'],
+        'silhouette_scores': silhouette_scores,
+        'recommended_k': clustering_service.recommend_k(pivot_data, K_RANGE),
+    }
+
+
+def cluster_detail(year_cube, cluster_industries):
+    # 한 군집의 업종 목록, 월별 패턴, 대표 업종, 주요 소비 분기, 번들 후보
+    industries_in_cluster = cluster_industries['업종'].tolist()
+    detail = {'industries': cluster_industries[['업종']], 'n_industries': len(industries_in_cluster)}
+    if not industries_in_cluster:
+        return detail
+
+    # 해당 업종들의 월별 소비 패턴 데이터
+    pattern_cube = year_cube.select(온라인업종=industries_in_cluster)
+    detail['monthly_pattern'] = pattern_cube.rollup(['월', '온라인업종'])
+
+    cluster_sum = pattern_cube.series('온라인업종').sort_values(ascending=False)
+    detail['top_industry'] = cluster_sum.index[0] if len(cluster_sum) > 0 else "없음"
+
+    # 분기별 소비 비중 (큐브의 파생 분기 차원)
+    quarterly_pattern = pattern_cube.series('분기')
+    quarterly_pattern.index = [f'{q}분기' for q in quarterly_pattern.index]
+    quarters = ['1분기', '2분기', '3분기', '4분기']
+    quarterly_pattern = quarterly_pattern.reindex(quarters)
+    quarterly_percentage = (quarterly_pattern / quarterly_pattern.sum() * 100).fillna(0)
+    percentages = [quarterly_percentage.get(q, 0) for q in quarters]
+
+    # 가장 소비가 많은 분기 찾기
+    max_quarter_idx = percentages.index(max(percentages))
+    detail['max_quarter'] = quarters[max_quarter_idx]
+    detail['max_quarter_pct'] = percentages[max_quarter_idx]
+
+    # 군집 내 업종 간의 교차 판매 기회
+    industry_pairs = []
+    if len(industries_in_cluster) > 1:
+        for idx, ind1 in enumerate(industries_in_cluster[:3]):
+            for ind2 in industries_in_cluster[idx+1:4]:
+                if ind2 not in industries_in_cluster[:3]: continue
+                industry_pairs.append(f"{ind1} + {ind2}")
+    detail['pairs_text'] = ", ".join(industry_pairs[:2])
+    return detail
+
+
+def segment_view(cube, year, entity, n_clusters, top_n=10):
+    # 탭3 세그먼트 모드: 대상별 업종 소비 구성비로 MiniBatchKMeans 군집 (표본 실루엣 점수)
+    features, totals = segment_features(cube.select(years=[year]), SEGMENT_ENTITIES[entity])
+    if len(features) <= n_clusters:
+        return None
+    fitted = clustering_service.segment(features, n_clusters)
+    labels = fitted['labels']
+
+    # 군집별 대상 수/총소비금액과 평균 업종 구성비(%)
+    sizes = pd.DataFrame({
+        '군집': range(n_clusters),
+        '대상 수': np.bincount(labels, minlength=n_clusters),
+        '총소비금액': np.bincount(labels, weights=totals.to_numpy(), minlength=n_clusters),
+    })
+    profiles = features.groupby(labels).mean() * 100
+    profiles.index.name = '군집'
+
+    # 군집별 소비 금액 상위 대상과 각 대상의 대표 업종
+    main_category = features.columns.to_numpy()[features.to_numpy().argmax(axis=1)]
+    members = pd.DataFrame({'총소비금액': totals.to_numpy(), '대표 업종': main_category, '군집': labels},
+                           index=features.index).reset_index()
+    top_members = [
+        members[members['군집'] == i].nlargest(top_n, '총소비금액').drop(columns='군집').reset_index(drop=True)
+        for i in range(n_clusters)
+    ]
+
+    return {
+        'n_entities': len(features),
+        'sizes': sizes,
+        'profiles': profiles,
+        'top_members': top_members,
+        'silhouette': fitted['silhouette'],
+        'silhouette_sample': fitted['silhouette_sample'],
+    }
+
+
+def share_shift_view(detector, months, n=10):
+    # 탭4: 선택 기간의 업종 소비 비중과 전월 대비 비중 변화 급증/급감 Top n
+    top_increase, top_decrease = detector.rank(months, n)
+    return {
+        'category_monthly': detector.table.frame(months),
+        'top_increase': top_increase,
+        'top_decrease': top_decrease,
+    }
+
+
+def share_shift_insight(cube, top_increase, profiles=None):
+    # 탭4 인사이트: 가장 급증한 업종의 주 소비층과 같은 달 번들 후보
+    # (profiles: 같은 큐브로 만든 CategoryProfiles, 없으면 여기서 만든다)
+    if len(top_increase) == 0:
+        return None
+    top_row = top_increase.iloc[0]
+    category = top_row['업종']
+    month = top_row['기준월']
+
+    profile = (profiles or CategoryProfiles.from_cube(cube))[category]
+    top_age = profile['top_age']
+
+    gender_ratio = profile['gender']
+    if len(gender_ratio) == 2:
+        male_ratio = gender_ratio.get('남성', 0)
+        female_ratio = gender_ratio.get('여성', 0)
+        if male_ratio > female_ratio:
+            gender_str = f"남성 선호 (남성 {male_ratio/(male_ratio+female_ratio)*100:.1f}%)"
+        else:
+            gender_str = f"여성 선호 (여성 {female_ratio/(male_ratio+female_ratio)*100:.1f}%)"
+    else:
+        gender_str = "데이터 부족"
+
+    # 같은 달에 소비된 업종 중 상위 3개 급증 업종에 속하는 업종
+    top3 = set(top_increase['업종'].values[:3])
+    month_cube = cube.select(months=[month])
+    bundle = [cat for cat in month_cube.values('온라인업종') if cat != category and cat in top3]
+
+    return {
+        'category': category,
+        'month': month,
+        'month_of_year': int(month_features([month])['월'][0]),
+        'change': top_row['비중변화'],
+        'top_age': top_age,
+        'gender_str': gender_str,
+        'bundle': bundle,
+    }
+
+
+def recommendation_view(cube, current_quarter, profiles=None):
+    # 탭5: 인기/성장/세그먼트/시즌 추천, 현재 분기 전략 (연간 마케팅 캘린더는 MarketingCalendar)
+    top_categories_overall = cube.series('온라인업종').nlargest(5)
+
+    # 최근 가장 성장한 업종 (첫 해와 마지막 해 비교)
+    years = cube.years
+    growth = None
+    if len(years) >= 2:
+        growth_df = growth_table(cube)['연간성장률'].dropna().sort_values(ascending=False).head(5)
+        growth = {
+            'first_year': years[0],
+            'last_year': years[-1],
+            'top': [{'category': c, 'growth': float(g)} for c, g in growth_df.items()],
+        }
+
+    # 연령대별 / 성별 / 분기별 / 월별 선호 업종 (큐브 롤업 한 번, 그룹별 argmax)
+    leaders = category_leaders(cube)
+
+    # 현재 분기 인기 업종의 주요 소비층/지역
+    strategy = None
+    current_q_top = [r for r in leaders['분기'] if r['group'] == current_quarter]
+    if current_q_top:
+        current_q_category = current_q_top[0]['category']
+        profile = (profiles or CategoryProfiles.from_cube(cube))[current_q_category]
+
+        bundle_partner = None
+        if len(top_categories_overall) >= 2:
+            for cat in top_categories_overall.index:
+                if cat != current_q_category:
+                    bundle_partner = cat
+                    break
+
+        strategy = {
+            'category': current_q_category,
+            'top_age': profile['top_age'],
+            'top_gender': profile['top_gender'] or "알 수 없음",
+            'top_districts': profile['districts'].index[:3].tolist(),
+            'bundle_partner': bundle_partner,
+        }
+
+    return {
+        'top_categories': top_categories_overall,
+        'growth': growth,
+        'leaders': leaders,
+        'strategy': strategy,
+    }
+
+
+# 이름 → 화면 계산 함수 (대시보드 캐시와 헤드리스 벤치마크에서 공통 사용)
+VIEWS = {
+    'trend': trend_view,
+    'region': region_view,
+    'district': district_view,
+    'cluster': cluster_view,
+    'segment': segment_view,
+    'share_shift': share_shift_view,
+    'share_shift_insight': share_shift_insight,
+    'share_anomalies': share_anomalies,
+    'recommendation': recommendation_view,
+}
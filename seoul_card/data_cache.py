@@ -0,0 +1,187 @@
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from seoul_card.sample_data import GENERATOR_VERSION, generate_online_card_data, generate_transaction_data
+
+# 디스크 캐시 위치 (환경변수로 변경 가능)
+DEFAULT_CACHE_DIR = os.environ.get(
+    'SEOUL_CARD_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'seoul_card')
+)
+
+# 기본 생성기
+GENERATORS = {
+    'online': generate_online_card_data,
+    'transaction': generate_transaction_data,
+}
+
+
+def frame_nbytes(df):
+    # 범주형/숫자형은 버퍼 크기, 문자열은 실제 객체 크기까지 포함
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class DatasetCache:
+    # (데이터셋 이름, 생성기 버전, 샘플 수, 시드) 단위로 데이터프레임을 보관하는 2단 캐시
+    # - 메모리: LRU 순서로 항목 수/바이트 한도를 넘으면 오래된 항목부터 제거
+    # - 디스크: pickle 파일로 저장해 프로세스를 재시작해도 재사용
+    # 반환된 데이터프레임은 여러 호출자가 공유하므로 수정하지 말고 복사해서 사용한다.
+    # 공용 잠금은 메모리 조회/갱신에만 쓰고, 생성과 디스크 입출력은 키별 잠금 안에서 한다
+    # (다른 키를 요청한 세션은 기다리지 않고, 같은 키를 동시에 요청하면 한 번만 생성한다).
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=8, max_bytes=1024 * 1024 * 1024,
+                 max_disk_bytes=4 * 1024 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+        # 생성/디스크 읽기 중인 키 → 키별 잠금
+        self._pending = {}
+        self.hits = {'memory': 0, 'disk': 0, 'miss': 0}
+
+    @staticmethod
+    def make_key(name, n_samples, seed, version=GENERATOR_VERSION):
+        return (name, int(version), int(n_samples), None if seed is None else int(seed))
+
+    def _disk_path(self, key):
+        name, version, n_samples, seed = key
+        safe_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in name)
+        return os.path.join(self.cache_dir, f'{safe_name}-v{version}-n{n_samples}-s{seed}.pkl')
+
+    def _lookup(self, key):
+        # 잠금 안에서 호출: 메모리 적중이면 LRU 순서를 갱신하고 돌려준다
+        if key not in self._memory:
+            return None
+        self._memory.move_to_end(key)
+        self.hits['memory'] += 1
+        return self._memory[key][0]
+
+    def _remember(self, key, df):
+        nbytes = frame_nbytes(df)
+        if nbytes > self.max_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[1]
+        self._memory[key] = (df, nbytes)
+        self._memory_bytes += nbytes
+        while self._memory and (len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes):
+            _, (_, evicted_bytes) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_bytes
+
+    def _read_disk(self, key):
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            df = pd.read_pickle(path)
+        except Exception:
+            # 손상된 캐시 파일은 버리고 다시 생성
+            os.remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            # 다른 세션이 한도 정리로 방금 지운 경우
+            pass
+        return df
+
+    def _write_disk(self, key, df):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._disk_path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+        self._trim_disk()
+
+    def _trim_disk(self):
+        # 디스크 한도를 넘으면 가장 오래 사용하지 않은 파일부터 삭제
+        entries = []
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith('.pkl'):
+                path = os.path.join(self.cache_dir, file_name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # 다른 세션이 동시에 정리한 파일
+                pass
+            total -= size
+
+    def get_or_create(self, name, n_samples, seed, factory, version=GENERATOR_VERSION):
+        # 시드가 없으면 매번 새 데이터이므로 캐시하지 않는다
+        if seed is None:
+            return factory()
+
+        key = self.make_key(name, n_samples, seed, version)
+        with self._lock:
+            df = self._lookup(key)
+            if df is not None:
+                return df
+            key_lock = self._pending.setdefault(key, threading.Lock())
+
+        with key_lock:
+            try:
+                # 기다리는 동안 먼저 들어온 요청이 만들어 두었을 수 있다
+                with self._lock:
+                    df = self._lookup(key)
+                if df is not None:
+                    return df
+
+                df = self._read_disk(key) if self.cache_dir else None
+                if df is not None:
+                    source = 'disk'
+                else:
+                    source = 'miss'
+                    df = factory()
+                    if self.cache_dir:
+                        self._write_disk(key, df)
+                with self._lock:
+                    self.hits[source] += 1
+                    self._remember(key, df)
+                return df
+            finally:
+                with self._lock:
+                    if self._pending.get(key) is key_lock:
+                        del self._pending[key]
+
+    def clear(self, disk=False):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if disk and self.cache_dir and os.path.isdir(self.cache_dir):
+                for file_name in os.listdir(self.cache_dir):
+                    if file_name.endswith('.pkl'):
+                        os.remove(os.path.join(self.cache_dir, file_name))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                **self.hits,
+            }
+
+
+# 프로세스 전체에서 공유하는 기본 캐시 (Streamlit 재실행 간에도 유지됨)
+dataset_cache = DatasetCache()
+
+
+def load_sample_dataset(kind, n_samples, seed=None, cache=None):
+    # 샘플 데이터셋을 캐시에서 가져오거나 생성한다
+    cache = dataset_cache if cache is None else cache
+    generator = GENERATORS[kind]
+    return cache.get_or_create(kind, n_samples, seed, lambda: generator(n_samples, seed=seed))
@@ -0,0 +1,63 @@
+import functools
+
+import numpy as np
+
+# 일 단위 날짜 파생 변수 (거래 데이터 열 이름)
+DAY_FEATURES = ['year', 'month', 'day', 'day_of_week', 'quarter']
+# 기준월('YYYYMM')에서 파생되는 시간 차원
+MONTH_FEATURES = ['연도', '월', '분기']
+
+
+@functools.lru_cache(maxsize=8)
+def day_table(start, end):
+    # start ~ end (양 끝 포함) 날짜마다 파생 변수를 한 번씩 계산한 조회표 {이름: [일 수] 배열}.
+    # 날짜 수(수천 개)만큼만 계산하고, 행 단위 값은 일 오프셋 정수 인덱싱으로 가져간다
+    days = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1)
+    month_starts = days.astype('datetime64[M]')
+    years = days.astype('datetime64[Y]')
+    months = (month_starts - years.astype('datetime64[M]')).astype(np.int64) + 1
+    table = {
+        'year': years.astype(np.int64) + 1970,
+        'month': months,
+        'day': (days - month_starts.astype('datetime64[D]')).astype(np.int64) + 1,
+        # 1970-01-01 은 목요일 (월요일 = 0)
+        'day_of_week': (days.astype(np.int64) + 3) % 7,
+        'quarter': (months - 1) // 3 + 1,
+    }
+    for values in table.values():
+        values.flags.writeable = False
+    return table
+
+
+def day_features(day_offsets, start, end, dtypes=None):
+    # start 로부터의 일 오프셋 배열 → {파생 변수: 행 단위 배열}. 조회표 열을 먼저 dtypes 로 바꾼 뒤 인덱싱한다
+    dtypes = dtypes or {}
+    table = day_table(np.datetime64(start, 'D'), np.datetime64(end, 'D'))
+    return {name: table[name].astype(dtypes.get(name, np.int64))[day_offsets] for name in DAY_FEATURES}
+
+
+def day_dates(day_offsets, start, unit='ns'):
+    # 일 오프셋 → datetime64 날짜 (문자열 변환 없이 정수 덧셈)
+    return (np.datetime64(start, 'D') + np.asarray(day_offsets).astype('timedelta64[D]')).astype(f'datetime64[{unit}]')
+
+
+def month_ordinals(months):
+    # 'YYYYMM' 라벨 → 연속 월 번호 (연도*12 + 월-1). 라벨을 정수로 한 번 바꾼 뒤에는 정수 연산만 쓴다
+    values = np.asarray(months, dtype=object).astype(np.int64)
+    return values // 100 * 12 + values % 100 - 1
+
+
+def month_features(months):
+    # 기준월 라벨 → {연도, 월, 분기: 정수 배열}
+    ordinals = month_ordinals(months)
+    month = ordinals % 12 + 1
+    return {'연도': ordinals // 12, '월': month, '분기': (month - 1) // 3 + 1}
+
+
+def date_columns(dates, dtypes=None):
+    # datetime64 날짜 배열 → {파생 변수: 배열}. 배열의 최소~최대 날짜 조회표를 일 오프셋으로 인덱싱한다
+    days = np.asarray(dates).astype('datetime64[D]')
+    if not len(days):
+        return {name: np.zeros(0, dtype=(dtypes or {}).get(name, np.int64)) for name in DAY_FEATURES}
+    start, end = days.min(), days.max()
+    return day_features((days - start).astype(np.int64), start, end, dtypes)
@@ -0,0 +1,293 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from seoul_card.date_features import month_features
+from seoul_card.regions import region_mapping
+from seoul_card.schema import TRANSACTION_SCHEMA
+
+# 그룹 집계 통계 (pandas groupby().agg() 이름과 같다)
+STATS = ['sum', 'count', 'mean']
+
+# DataFrame 입력을 나누는 청크 행 수 (청크 하나와 그 부분 집계만 동시에 메모리에 올라간다)
+DEFAULT_CHUNK_ROWS = 1_000_000
+# 동시에 처리하는 청크 수 기본값 (환경변수 SEOUL_CARD_WORKERS 로 변경 가능, 명시한 workers 인자가 우선).
+# 작업마다 청크 하나와 그 부분 집계를 메모리에 올리고 스레드는 GIL 을 놓는 구간(Parquet 읽기, 정렬)만 겹치므로,
+# 8개를 넘기면 속도는 거의 늘지 않고 메모리만 늘어 코어 수와 8 중 작은 값을 쓴다
+DEFAULT_WORKERS = int(os.environ.get('SEOUL_CARD_WORKERS') or 0) or min(8, os.cpu_count() or 1)
+# 그룹 라벨 곱 공간이 이 크기 이하이면 bincount 밀집 배열로, 넘으면 정렬(np.unique)로 그룹을 찾는다
+DENSE_LIMIT = 1 << 22
+
+
+def _region_labels(level, labels):
+    # 행정동 코드 라벨 → level 단위 라벨 (대응표는 호출마다 한 번만 만든다)
+    mapping = region_mapping(labels, level)
+    return [mapping[label] for label in labels]
+
+
+# 원본 열이 아니어도 그룹 차원으로 쓸 수 있는 파생 차원: 이름 → (원본 열, 원본 라벨 → 파생 라벨, 범주형 dtype)
+# 파생 라벨은 원본 라벨(범주)마다 한 번만 계산하고 행에는 코드 조회로 적용한다
+DERIVED_DIMS = {
+    '분기': ('기준월', lambda labels: month_features(labels)['분기'], None),
+    '구': ('고객행정동코드', partial(_region_labels, '구'), None),
+    '시': ('고객행정동코드', partial(_region_labels, '시'), None),
+    'day_name': ('day_of_week', lambda labels: [TRANSACTION_SCHEMA['day_name'].categories[d] for d in labels],
+                 TRANSACTION_SCHEMA['day_name']),
+    'season': ('quarter', lambda labels: [TRANSACTION_SCHEMA['season'].categories[q - 1] for q in labels],
+               TRANSACTION_SCHEMA['season']),
+}
+
+
+def _encode(frame, dim):
+    # 한 청크의 그룹 차원 → (행별 코드, 라벨 Index, 범주형 dtype 또는 None). 결측은 코드 -1
+    if dim not in frame.columns and dim in DERIVED_DIMS:
+        source, mapper, dtype = DERIVED_DIMS[dim]
+        codes, labels, _ = _encode(frame, source)
+        derived = list(mapper(list(labels)))
+        target = dtype.categories if dtype is not None else pd.Index(sorted(set(derived)))
+        lookup = target.get_indexer(derived)
+        if not len(lookup):
+            return codes, target, dtype
+        return np.where(codes >= 0, lookup[np.maximum(codes, 0)], -1), target, dtype
+    values = frame[dim]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories, values.dtype
+    codes, uniques = pd.factorize(values, sort=True)
+    return codes, pd.Index(uniques, dtype=values.dtype), None
+
+
+def _ravel(codes, shape, n):
+    if not shape:
+        return np.zeros(n, dtype=np.int64)
+    return np.ravel_multi_index(codes, shape).astype(np.int64)
+
+
+def _unravel(keys, shape):
+    if not shape:
+        return []
+    return list(np.unravel_index(keys, shape))
+
+
+class GroupedPartial:
+    # 청크 하나(또는 여러 청크를 합친) 그룹 집계의 부분 결과.
+    # 관측된 그룹만 (라벨 곱 공간의 평탄 키, 측정값별 합계·개수) 로 보관하므로 크기는 행 수가 아니라 그룹 수에 비례하고,
+    # 부분 결과끼리는 키를 맞춰 더하기만 하면 합쳐진다 (평균은 마지막에 합계 / 개수).
+
+    def __init__(self, by, labels, dtypes, keys, rows, sums, counts):
+        self.by = list(by)
+        self.labels = list(labels)
+        self.dtypes = list(dtypes)
+        self.keys = keys
+        self.rows = rows
+        self.sums = sums
+        self.counts = counts
+
+    @property
+    def shape(self):
+        return tuple(len(labels) for labels in self.labels)
+
+    @classmethod
+    def empty(cls, by, measures):
+        # 입력 청크가 하나도 없을 때의 빈 결과
+        empty = np.zeros(0, dtype=np.int64)
+        return cls(by, [pd.Index([]) for _ in by], [None] * len(by), empty, empty,
+                   {m: empty for m in measures}, {m: empty for m in measures})
+
+    @classmethod
+    def from_frame(cls, frame, by, measures):
+        encoded = [_encode(frame, dim) for dim in by]
+        labels = [labels for _, labels, _ in encoded]
+        dtypes = [dtype for _, _, dtype in encoded]
+        shape = tuple(len(l) for l in labels)
+        codes = [c for c, _, _ in encoded]
+        valid = np.logical_and.reduce([c >= 0 for c in codes]) if codes else np.ones(len(frame), dtype=bool)
+        if not valid.all():
+            codes = [c[valid] for c in codes]
+        flat = _ravel(codes, shape, int(valid.sum()))
+
+        size = int(np.prod(shape))
+        if size <= DENSE_LIMIT:
+            # 작은 라벨 공간: 평탄 키가 곧 그룹 번호
+            group, n_groups = flat, size
+        else:
+            unique_keys, group = np.unique(flat, return_inverse=True)
+            n_groups = len(unique_keys)
+        rows = np.bincount(group, minlength=n_groups)
+        observed = np.flatnonzero(rows) if size <= DENSE_LIMIT else np.arange(n_groups)
+        keys = observed if size <= DENSE_LIMIT else unique_keys
+
+        sums, counts = {}, {}
+        for measure in measures:
+            values = frame[measure].to_numpy()
+            if not valid.all():
+                values = values[valid]
+            present = ~pd.isna(values)
+            weights = np.where(present, values, 0).astype(np.float64)
+            total = np.bincount(group, weights=weights, minlength=n_groups)[observed]
+            # 정수 측정값은 정수 합계로 (AggregateCube 와 같은 방식)
+            sums[measure] = total.round().astype(np.int64) if values.dtype.kind in 'iub' else total
+            counts[measure] = np.bincount(group[present], minlength=n_groups)[observed].astype(np.int64)
+        return cls(by, labels, dtypes, keys.astype(np.int64), rows[observed].astype(np.int64), sums, counts)
+
+    @classmethod
+    def merge(cls, partials):
+        # 같은 질의의 부분 결과들을 합친다. 차원 라벨이 다르면(비범주형 열) 합집합 라벨로 키를 다시 계산한다
+        partials = list(partials)
+        first = partials[0]
+        if len(partials) == 1:
+            return first
+        labels, dtypes = [], list(first.dtypes)
+        for i in range(len(first.by)):
+            candidates = [p.labels[i] for p in partials]
+            if all(c.equals(candidates[0]) for c in candidates[1:]):
+                labels.append(candidates[0])
+            elif dtypes[i] is not None:
+                # 청크마다 고정 범주 뒤에 덧붙은 신규 값이 다를 수 있다: 처음 나온 순서대로 이어 붙인다
+                union = candidates[0]
+                for c in candidates[1:]:
+                    union = union.append(c.difference(union, sort=False))
+                dtypes[i] = pd.CategoricalDtype(union, ordered=dtypes[i].ordered)
+                labels.append(union)
+            else:
+                union = candidates[0]
+                for c in candidates[1:]:
+                    union = union.union(c)
+                labels.append(union)
+        shape = tuple(len(l) for l in labels)
+
+        flat = []
+        for p in partials:
+            codes = _unravel(p.keys, p.shape)
+            codes = [c if p.labels[i].equals(labels[i]) else labels[i].get_indexer(p.labels[i])[c]
+                     for i, c in enumerate(codes)]
+            flat.append(_ravel(codes, shape, len(p.keys)))
+        keys, group = np.unique(np.concatenate(flat), return_inverse=True)
+
+        def combine(arrays):
+            values = np.concatenate(arrays)
+            out = np.zeros(len(keys), dtype=values.dtype)
+            np.add.at(out, group, values)
+            return out
+
+        sums = {m: combine([p.sums[m] for p in partials]) for m in first.sums}
+        counts = {m: combine([p.counts[m] for p in partials]) for m in first.counts}
+        return cls(first.by, labels, dtypes, keys, combine([p.rows for p in partials]), sums, counts)
+
+    def index(self):
+        # 그룹 키 → pandas 인덱스 (범주형 차원은 원래 범주형 dtype 유지, groupby(observed=True, sort=True) 와 같은 순서)
+        codes = _unravel(self.keys, self.shape)
+        levels = []
+        for labels, dtype, c in zip(self.labels, self.dtypes, codes):
+            levels.append(pd.Categorical.from_codes(c, dtype=dtype) if dtype is not None else labels.take(c))
+        if not self.by:
+            return pd.RangeIndex(len(self.keys))
+        if len(self.by) == 1:
+            return pd.Index(levels[0], name=self.by[0])
+        return pd.MultiIndex.from_arrays(levels, names=self.by)
+
+    def to_frame(self, stats=STATS):
+        # 측정값이 하나면 열은 stats, 여러 개면 (측정값, stat) MultiIndex 열
+        index = self.index()
+        columns = {}
+        for measure in self.sums:
+            for stat in stats:
+                if stat == 'sum':
+                    values = self.sums[measure]
+                elif stat == 'count':
+                    values = self.counts[measure]
+                elif stat == 'mean':
+                    with np.errstate(invalid='ignore', divide='ignore'):
+                        values = self.sums[measure] / self.counts[measure]
+                else:
+                    raise ValueError(f'지원하지 않는 통계: {stat}')
+                columns[(measure, stat)] = values
+        frame = pd.DataFrame(columns, index=index)
+        if len(self.sums) == 1:
+            frame.columns = frame.columns.droplevel(0)
+        return frame
+
+
+def bounded_map(func, items, workers=None):
+    # items 를 스레드 풀에서 func 로 처리해 입력 순서대로 돌려준다.
+    # 진행 중인 작업은 workers 개까지만 두므로 items 가 청크를 읽는 작업이면 메모리에도 청크 workers 개만 올라간다
+    workers = workers or DEFAULT_WORKERS
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            if len(pending) >= workers:
+                yield pending.popleft().result()
+            pending.append(pool.submit(func, item))
+        while pending:
+            yield pending.popleft().result()
+
+
+def chunk_loaders(source, chunk_rows=DEFAULT_CHUNK_ROWS):
+    # 집계 입력을 '청크를 돌려주는 함수' 들로 나눈다. 실제 읽기는 작업 스레드에서 일어난다.
+    # - DataFrame: chunk_rows 행 구간 슬라이스 (복사 없음)
+    # - 파티션 데이터셋(PartitionedDataset): 선택된 기준월 파티션을 하나씩
+    # - 그 밖의 반복 가능한 청크 묶음 (ingest.iter_source_chunks 등): 순서대로 그대로
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunk_rows):
+            yield partial(source.iloc.__getitem__, slice(start, start + chunk_rows))
+    elif hasattr(source, 'iter_partitions') and hasattr(source, 'read_partition'):
+        for month in source.months:
+            yield partial(source.read_partition, month)
+    else:
+        for chunk in source:
+            yield partial(lambda frame: frame, chunk)
+
+
+class AggregationEngine:
+    # 청크/파티션 단위 그룹 집계 엔진 (sum/count/mean, 그룹 차원은 원본 열 또는 DERIVED_DIMS 의 임의 조합).
+    # 청크마다 부분 집계를 만들어 곧바로 누적 결과에 합치므로, 메모리에는 처리 중인 청크 workers 개와
+    # 그룹 수 크기의 누적 결과만 남는다. 여러 질의는 한 번의 스캔에서 함께 계산한다.
+    # 청크 읽기(Parquet 디코딩)와 부분 집계는 스레드 풀에서 병렬로 실행한다.
+    # 메모리에 있는 DataFrame 은 executor(executor.GroupByExecutor) 를 주면 행 블록 단위 멀티코어 집계로 계산한다.
+
+    def __init__(self, source, workers=None, chunk_rows=DEFAULT_CHUNK_ROWS, prepare=None, executor=None):
+        self.source = source
+        self.workers = workers
+        self.chunk_rows = chunk_rows
+        # 청크마다 집계 전에 적용할 변환 (스키마 변환, 파생 열 추가 등)
+        self.prepare = prepare
+        self.executor = executor
+        self.n_rows = None
+
+    def _scan_chunk(self, queries, measures, load):
+        frame = load()
+        if self.prepare is not None:
+            frame = self.prepare(frame)
+        return len(frame), {name: GroupedPartial.from_frame(frame, by, measures) for name, by in queries.items()}
+
+    def partials(self, queries, measures):
+        # {질의 이름: 그룹 차원} 을 한 번의 스캔으로 계산해 {질의 이름: GroupedPartial} 을 돌려준다
+        queries = {name: [by] if isinstance(by, str) else list(by) for name, by in queries.items()}
+        measures = [measures] if isinstance(measures, str) else list(measures)
+        if self.executor is not None and isinstance(self.source, pd.DataFrame):
+            frame = self.source if self.prepare is None else self.prepare(self.source)
+            self.n_rows = len(frame)
+            return self.executor.partials(frame, queries, measures)
+        totals = {}
+        n_rows = 0
+        scan = partial(self._scan_chunk, queries, measures)
+        for rows, chunk_partials in bounded_map(scan, chunk_loaders(self.source, self.chunk_rows), self.workers):
+            n_rows += rows
+            for name, p in chunk_partials.items():
+                totals[name] = p if name not in totals else GroupedPartial.merge([totals[name], p])
+        self.n_rows = n_rows
+        return {name: totals.get(name) or GroupedPartial.empty(by, measures) for name, by in queries.items()}
+
+    def aggregate_many(self, queries, measures, stats=STATS):
+        return {name: p.to_frame(stats) for name, p in self.partials(queries, measures).items()}
+
+    def aggregate(self, by, measures, stats=STATS):
+        # groupby(by, observed=True)[measures].agg(stats) 와 같은 결과
+        return self.aggregate_many({'result': by}, measures, stats)['result']
@@ -0,0 +1,208 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+from seoul_card.engine import DEFAULT_WORKERS, DERIVED_DIMS, STATS, GroupedPartial
+
+# 행 구간 블록 크기. 블록 경계와 병합 순서가 작업 수와 무관하게 고정이므로 결과는 작업 수·방식과 관계없이 직렬 실행과 같다
+BLOCK_ROWS = 1 << 18
+
+BACKENDS = ['thread', 'process']
+
+# 벤치마크 기본 질의 (분석 리포트의 그룹 집계와 같은 종류)
+BENCHMARK_QUERIES = {
+    'year_month': ['year', 'month'],
+    'year_quarter_category': ['year', 'quarter', 'category'],
+    'district_category': ['district', 'category'],
+    'age_gender': ['age_group', 'gender'],
+    'customer': ['customer_id'],
+    'day_name': ['day_name'],
+}
+
+
+def _source_columns(frame, queries, measures):
+    # 질의에 필요한 원본 열 (파생 차원은 원본 열로 바꿔서)
+    columns = []
+    for by in queries.values():
+        for dim in by:
+            column = DERIVED_DIMS[dim][0] if dim not in frame.columns and dim in DERIVED_DIMS else dim
+            if column not in columns:
+                columns.append(column)
+    return columns + [m for m in measures if m not in columns]
+
+
+def _share(array):
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm
+
+
+def _attach(name):
+    # 작업 프로세스는 공유 메모리에 붙기만 하고 해제는 만든 프로세스가 한다 (resource_tracker 에 등록하지 않음)
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python 3.12 이하에는 track 인자가 없다
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _block_frame(columns, start, stop):
+    # 열 사양 {열: (배열, 범주형 dtype 또는 None)} 에서 [start, stop) 행 블록 DataFrame (범주형은 코드로 복원)
+    data = {}
+    for name, (values, dtype) in columns.items():
+        block = values[start:stop]
+        data[name] = pd.Categorical.from_codes(block, dtype=dtype) if dtype is not None else block
+    return pd.DataFrame(data, copy=False)
+
+
+def _block_partials(columns, queries, measures, start, stop):
+    frame = _block_frame(columns, start, stop)
+    return {name: GroupedPartial.from_frame(frame, by, measures) for name, by in queries.items()}
+
+
+def _process_block(specs, queries, measures, start, stop):
+    # 작업 프로세스: 공유 메모리 열에 붙어 자기 행 구간만 집계한다 (행 데이터 복사·직렬화 없음)
+    handles, columns = [], {}
+    try:
+        for name, (shm_name, shape, dtype, categories) in specs.items():
+            shm = _attach(shm_name)
+            handles.append(shm)
+            columns[name] = (np.ndarray(shape, dtype=dtype, buffer=shm.buf), categories)
+        return _block_partials(columns, queries, measures, start, stop)
+    finally:
+        columns.clear()
+        for shm in handles:
+            shm.close()
+
+
+class GroupByExecutor:
+    # 멀티코어 그룹 집계 실행기. 데이터프레임을 BLOCK_ROWS 행 구간으로 나눠 블록마다 부분 집계를 만들고 블록 순서대로 합친다.
+    # - process: 필요한 열만 공유 메모리 numpy 버퍼로 한 번 복사하고(범주형은 코드만), 작업 프로세스가 행 구간만 읽는다
+    # - thread: 같은 블록을 스레드에서 처리 (정렬 등 GIL 을 놓는 커널만 겹쳐 실행된다)
+    # 작업 수가 1 이면 같은 블록을 현재 프로세스에서 차례로 처리한다 (직렬 기준 경로).
+
+    def __init__(self, workers=None, backend='process', block_rows=BLOCK_ROWS):
+        if backend not in BACKENDS:
+            raise ValueError(f'알 수 없는 실행 방식: {backend} (가능: {BACKENDS})')
+        self.workers = workers or DEFAULT_WORKERS
+        self.backend = backend
+        self.block_rows = block_rows
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _executor(self):
+        if self._pool is None:
+            pool_class = ProcessPoolExecutor if self.backend == 'process' else ThreadPoolExecutor
+            self._pool = pool_class(max_workers=self.workers)
+        return self._pool
+
+    def _blocks(self, n_rows):
+        return [(start, min(start + self.block_rows, n_rows)) for start in range(0, n_rows, self.block_rows)]
+
+    def _columns(self, frame, queries, measures):
+        columns = {}
+        for name in _source_columns(frame, queries, measures):
+            values = frame[name]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                columns[name] = (values.cat.codes.to_numpy(), values.dtype)
+            else:
+                columns[name] = (values.to_numpy(), None)
+        return columns
+
+    def _run_shared(self, columns, queries, measures, blocks):
+        handles, specs = [], {}
+        try:
+            for name, (values, dtype) in columns.items():
+                if values.dtype.kind not in 'biufcmM':
+                    raise ValueError(f"'{name}' 열은 공유 메모리로 보낼 수 없습니다 (숫자·날짜·범주형만 가능, backend='thread' 사용)")
+                shm = _share(values)
+                handles.append(shm)
+                specs[name] = (shm.name, values.shape, values.dtype.str, dtype)
+            futures = [self._executor().submit(_process_block, specs, queries, measures, start, stop)
+                       for start, stop in blocks]
+            return [future.result() for future in futures]
+        finally:
+            for shm in handles:
+                shm.close()
+                shm.unlink()
+
+    def partials(self, frame, queries, measures):
+        # {질의 이름: 그룹 차원} 을 블록 병렬로 계산해 {질의 이름: GroupedPartial} 을 돌려준다
+        queries = {name: [by] if isinstance(by, str) else list(by) for name, by in queries.items()}
+        measures = [measures] if isinstance(measures, str) else list(measures)
+        blocks = self._blocks(len(frame))
+        if not blocks:
+            return {name: GroupedPartial.empty(by, measures) for name, by in queries.items()}
+        columns = self._columns(frame, queries, measures)
+
+        if self.workers <= 1 or len(blocks) == 1:
+            results = [_block_partials(columns, queries, measures, start, stop) for start, stop in blocks]
+        elif self.backend == 'process':
+            results = self._run_shared(columns, queries, measures, blocks)
+        else:
+            futures = [self._executor().submit(_block_partials, columns, queries, measures, start, stop)
+                       for start, stop in blocks]
+            results = [future.result() for future in futures]
+        return {name: GroupedPartial.merge([r[name] for r in results]) for name in queries}
+
+    def aggregate(self, frame, by, measures, stats=STATS):
+        # groupby(by, observed=True)[measures].agg(stats) 와 같은 결과
+        return self.partials(frame, {'result': by}, measures)['result'].to_frame(stats)
+
+
+def benchmark(rows=2_000_000, workers=(1, 2, 4, 8), backend='process', seed=0, repeat=3, queries=None):
+    # 작업 수별 그룹 집계 시간 (최솟값)과 직렬 대비 속도, 직렬 결과와의 일치 여부
+    from seoul_card.sample_data import generate_transaction_data
+
+    queries = queries or BENCHMARK_QUERIES
+    frame = generate_transaction_data(rows, seed=seed)
+    baseline, serial_seconds, records = None, None, []
+    for n_workers in workers:
+        with GroupByExecutor(n_workers, backend) as executor:
+            executor.partials(frame.iloc[:executor.block_rows * n_workers], queries, 'amount')  # 풀 시작 비용 제외
+            seconds = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                result = executor.partials(frame, queries, 'amount')
+                seconds.append(time.perf_counter() - start)
+        tables = {name: partial.to_frame() for name, partial in result.items()}
+        if baseline is None:
+            baseline, serial_seconds = tables, min(seconds)
+        records.append({
+            'workers': n_workers,
+            'seconds': min(seconds),
+            'speedup': serial_seconds / min(seconds),
+            'identical': all(tables[name].equals(baseline[name]) for name in tables),
+        })
+    return pd.DataFrame(records)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='멀티코어 그룹 집계 실행기 벤치마크 (작업 수별 속도 향상)')
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--backend', choices=BACKENDS, default='process')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    report = benchmark(args.rows, args.workers, args.backend, repeat=args.repeat)
+    print(report.to_string(index=False, formatters={'seconds': '{:.3f}s'.format, 'speedup': '{:.2f}x'.format}))
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from seoul_card.aggregate_cube import ROW_COUNT
+from seoul_card.date_features import month_features, month_ordinals
+
+# growth_table() 결과 열 (모두 % 단위)
+# 성장률: 첫 기준월 → 마지막 기준월, MoM: 마지막 기준월의 직전 월 대비, YoY: 마지막 기준월의 전년 동월 대비,
+# 연간성장률: 첫 연도 → 마지막 연도 합계, CAGR: 첫 연도 → 마지막 연도 연평균 성장률
+GROWTH_COLUMNS = ['시작금액', '종료금액', '성장률', 'MoM', 'YoY', '연간성장률', 'CAGR']
+
+
+def timeline(cube, by, measure='카드이용금액계'):
+    # (대상 × 기준월) 금액 배열. 레코드가 없는 셀은 NaN, 어느 대상에도 데이터가 없는 기준월은 제외
+    by = [by] if isinstance(by, str) else list(by)
+    values, labels = cube.dense(by + ['기준월'], measure)
+    rows, _ = cube.dense(by + ['기준월'], ROW_COUNT)
+    n_months = values.shape[-1]
+    values = values.reshape(-1, n_months).astype(np.float64)
+    rows = rows.reshape(-1, n_months)
+    values[rows == 0] = np.nan
+
+    present = rows.sum(axis=0) > 0
+    months = [m for m, keep in zip(labels[-1], present) if keep]
+    if len(by) == 1:
+        index = pd.Index(labels[0], name=by[0])
+    else:
+        index = pd.MultiIndex.from_product(labels[:-1], names=by)
+    return index, months, values[:, present]
+
+
+def pct_change(current, previous):
+    # (현재 - 이전) / 이전 * 100, 이전 값이 없거나 0이면 NaN/inf 그대로
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (current - previous) / previous * 100
+
+
+def lagged_growth(values, months, lag):
+    # 모든 대상·기준월에 대해 lag 개월 전 대비 성장률 행렬 (lag 개월 전 기준월이 없으면 NaN)
+    ordinals = month_ordinals(months)
+    position = np.searchsorted(ordinals, ordinals - lag)
+    position = np.minimum(position, len(ordinals) - 1)
+    found = ordinals[position] == ordinals - lag
+    result = np.full(values.shape, np.nan)
+    if found.any():
+        result[:, found] = pct_change(values[:, found], values[:, position[found]])
+    return result
+
+
+def annual_totals(values, months):
+    # 연도별 합계 (대상 × 연도), 한 해 전체에 레코드가 없으면 NaN
+    years = month_features(months)['연도']
+    unique_years = np.unique(years)
+    totals = np.full((values.shape[0], len(unique_years)), np.nan)
+    for i, year in enumerate(unique_years):
+        block = values[:, years == year]
+        has_data = ~np.isnan(block).all(axis=1)
+        totals[has_data, i] = np.nansum(block[has_data], axis=1)
+    return unique_years, totals
+
+
+def growth_table(cube, by='온라인업종', measure='카드이용금액계'):
+    # 대상(업종, 행정동, 세그먼트 등) 전체의 기간 대비 성장 지표를 한 번에 계산한다 (대상별 반복 없음)
+    index, months, values = timeline(cube, by, measure)
+    table = pd.DataFrame(np.nan, index=index, columns=GROWTH_COLUMNS)
+    if not months:
+        return table
+
+    first, last = values[:, 0], values[:, -1]
+    table['시작금액'] = first
+    table['종료금액'] = last
+    table['성장률'] = pct_change(last, first)
+    table['MoM'] = lagged_growth(values, months, 1)[:, -1]
+    table['YoY'] = lagged_growth(values, months, 12)[:, -1]
+
+    years, annual = annual_totals(values, months)
+    if len(years) >= 2:
+        table['연간성장률'] = pct_change(annual[:, -1], annual[:, 0])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            table['CAGR'] = ((annual[:, -1] / annual[:, 0]) ** (1 / (years[-1] - years[0])) - 1) * 100
+    return table
@@ -0,0 +1,230 @@
+import argparse
+import hashlib
+import os
+import shutil
+import time
+
+import pandas as pd
+
+from seoul_card.partitions import PARTITION_KEY, PartitionedDataset
+from seoul_card.schema import add_time_columns, coerce_online
+
+# 실데이터 원본 열 (generate_online_card_data 와 동일)
+SOURCE_COLUMNS = ['기준월', '온라인업종', '고객행정동코드', '연령대', '성별', '카드이용건수', '카드이용금액계']
+
+# 문자열로 읽어야 하는 코드성 열 (앞자리 0, 숫자형 추론 방지)
+_STRING_COLUMNS = {'기준월': str, '고객행정동코드': str, '온라인업종': str, '연령대': str, '성별': str}
+
+# 비어 있으면 정수형 변환이 실패하므로 읽을 때 버리는 측정값 열
+_MEASURE_COLUMNS = ['카드이용건수', '카드이용금액계']
+
+DEFAULT_CHUNKSIZE = 500_000
+
+
+def detect_encoding(path, sample_bytes=1 << 16):
+    # 앞부분을 UTF-8로 디코딩해 보고 실패하면 CP949 (공공데이터 CSV 기본 인코딩)
+    with open(path, 'rb') as f:
+        sample = f.read(sample_bytes)
+    if sample.startswith(b'\xef\xbb\xbf'):
+        return 'utf-8-sig'
+    # 샘플 끝에서 잘린 멀티바이트 문자를 피하려고 마지막 줄바꿈까지만 검사
+    cut = sample.rfind(b'\n')
+    if cut > 0 and len(sample) == sample_bytes:
+        sample = sample[:cut]
+    try:
+        sample.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp949'
+
+
+def _finish_chunk(chunk):
+    # 원본 열만 남기고 compact 스키마로 변환한 뒤 연도/월을 기준월 범주에서 계산
+    return add_time_columns(coerce_online(chunk[SOURCE_COLUMNS]))
+
+
+def iter_csv_chunks(path, chunksize=DEFAULT_CHUNKSIZE, encoding=None):
+    # CSV를 chunksize 행씩 읽어 compact 스키마 청크로 돌려준다 (메모리 사용량은 청크 크기에 비례)
+    encoding = encoding or detect_encoding(path)
+    reader = pd.read_csv(
+        path,
+        encoding=encoding,
+        usecols=SOURCE_COLUMNS,
+        dtype=_STRING_COLUMNS,
+        thousands=',',
+        chunksize=chunksize,
+    )
+    with reader:
+        for chunk in reader:
+            chunk = chunk.dropna(subset=_MEASURE_COLUMNS)
+            # 후처리: 거래액이 0원인 레코드 제거
+            chunk = chunk[chunk['카드이용금액계'] > 0]
+            yield _finish_chunk(chunk)
+
+
+def iter_parquet_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    # 단일 Parquet 파일을 row group/batch 단위로 스트리밍
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunksize, columns=SOURCE_COLUMNS):
+        chunk = batch.to_pandas().dropna(subset=_MEASURE_COLUMNS)
+        chunk = chunk[chunk['카드이용금액계'] > 0]
+        yield _finish_chunk(chunk)
+
+
+def iter_source_chunks(path, chunksize=DEFAULT_CHUNKSIZE, encoding=None):
+    if path.lower().endswith('.parquet'):
+        return iter_parquet_chunks(path, chunksize=chunksize)
+    return iter_csv_chunks(path, chunksize=chunksize, encoding=encoding)
+
+
+def iter_table_chunks(path, chunksize=DEFAULT_CHUNKSIZE, encoding=None, parse_dates=None):
+    # 임의 스키마의 CSV/Parquet 파일을 변환 없이 chunksize 행씩 읽는다 (거래 스키마 등, 변환은 호출 측에서)
+    if path.lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+        return
+    reader = pd.read_csv(path, encoding=encoding or detect_encoding(path), parse_dates=parse_dates,
+                         thousands=',', chunksize=chunksize)
+    with reader:
+        yield from reader
+
+
+def partition_dir(root, month):
+    return os.path.join(root, f'{PARTITION_KEY}={month}')
+
+
+def write_partitions(chunk, root, part_name):
+    # 한 청크를 기준월별로 나눠 root/기준월=YYYYMM/<part_name>.parquet 으로 저장
+    written = []
+    for month, part in chunk.groupby(PARTITION_KEY, observed=True, sort=False):
+        directory = partition_dir(root, month)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{part_name}.parquet')
+        part.to_parquet(path, index=False)
+        written.append(path)
+    return written
+
+
+def ingest(path, out_dir, chunksize=DEFAULT_CHUNKSIZE, encoding=None, overwrite=False):
+    # CSV/Parquet 원본을 청크 단위로 읽어 기준월 파티션 Parquet 데이터셋으로 변환한다
+    if overwrite and os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+
+    # 같은 폴더에 여러 원본을 넣어도 파일명이 겹치지 않도록 원본 경로 해시를 접두어로 사용
+    prefix = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:8]
+    # 같은 원본을 다시 넣으면 이전 실행의 파일을 먼저 지운다 (청크 수가 달라져도 행이 중복 집계되지 않도록)
+    for month in list_partitions(out_dir):
+        directory = partition_dir(out_dir, month)
+        for name in os.listdir(directory):
+            if name.startswith(f'part-{prefix}-') and name.endswith('.parquet'):
+                os.remove(os.path.join(directory, name))
+        if not os.listdir(directory):
+            os.rmdir(directory)
+    n_rows = 0
+    files = []
+    for i, chunk in enumerate(iter_source_chunks(path, chunksize=chunksize, encoding=encoding)):
+        files.extend(write_partitions(chunk, out_dir, f'part-{prefix}-{i:05d}'))
+        n_rows += len(chunk)
+    return {'rows': n_rows, 'files': len(files), 'months': list_partitions(out_dir)}
+
+
+def list_partitions(root):
+    prefix = f'{PARTITION_KEY}='
+    if not os.path.isdir(root):
+        return []
+    return sorted(name[len(prefix):] for name in os.listdir(root) if name.startswith(prefix))
+
+
+class ParquetDataset(PartitionedDataset):
+    # 기준월 파티션 Parquet 데이터셋을 지연 로딩한다.
+    # 열 때는 디렉터리 목록만 읽고, 실제 행은 선택된 파티션만 필요할 때 읽는다.
+
+    def __init__(self, root):
+        super().__init__(list_partitions(root))
+        self.root = root
+        self._signatures = {month: self.partition_signature(month) for month in self.months}
+        # 기준월별 (파티션 시그니처, 행 수): 시그니처가 같은 동안은 Parquet 푸터를 다시 읽지 않는다
+        self._row_counts = {}
+
+    def partition_signature(self, month):
+        # 파티션 파일 목록/크기/수정시각 (파티션 단위 변경 감지용)
+        directory = partition_dir(self.root, month)
+        signature = []
+        for name in sorted(os.listdir(directory)):
+            stat = os.stat(os.path.join(directory, name))
+            signature.append(f'{name}:{stat.st_size}:{stat.st_mtime_ns}')
+        return tuple(signature)
+
+    def month_signature(self, month):
+        signature = self._signatures.get(month)
+        return None if signature is None else f'{os.path.abspath(self.root)}/{month}/' + ';'.join(signature)
+
+    def refresh(self):
+        # 디스크를 다시 훑어 새로 생기거나 바뀌거나 사라진 기준월 파티션만 무효화한다
+        # (python -m seoul_card.ingest 로 새 기준월을 추가한 뒤 전체를 다시 만들지 않도록)
+        current = list_partitions(self.root)
+        signatures = {month: self.partition_signature(month) for month in current}
+        with self._lock:
+            changed = sorted(
+                month for month in set(signatures) | set(self._signatures)
+                if signatures.get(month) != self._signatures.get(month)
+            )
+            for month in changed:
+                self._partition_cubes.pop(month, None)
+                self._row_counts.pop(month, None)
+                self._generations[month] = self._generations.get(month, 0) + 1
+            self._signatures = signatures
+            self.months = current
+            if changed:
+                self.version += 1
+        self._notify(changed)
+        return changed
+
+    def _store_partition(self, month, rows):
+        write_partitions(rows, self.root, f'part-append-{time.time_ns():x}')
+        self._signatures[month] = self.partition_signature(month)
+        self._row_counts.pop(month, None)
+
+    def partition_files(self, month):
+        directory = partition_dir(self.root, month)
+        return [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.endswith('.parquet')]
+
+    def read_partition(self, month, columns=None):
+        df = pd.read_parquet(partition_dir(self.root, month), columns=columns)
+        # 파티션마다 범주 사전이 다를 수 있으므로 다시 스키마로 맞춘다
+        return coerce_online(df)
+
+    def partition_rows(self, month):
+        # Parquet 메타데이터의 행 수만 읽고, 파티션이 바뀔 때까지 기억한다
+        import pyarrow.parquet as pq
+
+        signature = self._signatures.get(month)
+        cached = self._row_counts.get(month)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        rows = sum(pq.read_metadata(path).num_rows for path in self.partition_files(month))
+        self._row_counts[month] = (signature, rows)
+        return rows
+
+
+def open_dataset(root):
+    return ParquetDataset(root)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='서울시 카드소비 CSV/Parquet 원본을 기준월 파티션 Parquet으로 변환')
+    parser.add_argument('source', help='원본 CSV 또는 Parquet 파일 경로')
+    parser.add_argument('out_dir', help='파티션 Parquet 데이터셋을 저장할 폴더')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--encoding', choices=['utf-8', 'utf-8-sig', 'cp949'], default=None)
+    parser.add_argument('--overwrite', action='store_true', help='기존 데이터셋을 지우고 새로 생성')
+    args = parser.parse_args()
+
+    summary = ingest(args.source, args.out_dir, chunksize=args.chunksize, encoding=args.encoding,
+                     overwrite=args.overwrite)
+    print(f"{summary['rows']:,}개 레코드 → {summary['files']}개 파일, 기준월 {len(summary['months'])}개")
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+from seoul_card.aggregate_cube import ROW_COUNT
+from seoul_card.date_features import month_features
+from seoul_card.shares import SHARE_DIM
+
+# 그룹별 1위 업종을 구하는 그룹 차원 (분기/월은 기준월에서 파생)
+LEADER_DIMS = ['연령대', '성별', '분기', '월']
+
+# 분기 → (기간, 시즌, 시즌 프로모션)
+QUARTER_THEMES = {
+    1: ('1-3월', '겨울-봄', '신년/봄맞이 프로모션'),
+    2: ('4-6월', '봄-여름', '여름 준비 프로모션'),
+    3: ('7-9월', '여름-가을', '휴가/개학 시즌 프로모션'),
+    4: ('10-12월', '가을-겨울', '연말/홀리데이 프로모션'),
+}
+
+
+def month_promotion(month):
+    # 월별 프로모션 추천
+    if month in [1, 2]:
+        return "신년/설날 특별 프로모션"
+    elif month in [3, 4, 5]:
+        return "봄 시즌 프로모션"
+    elif month in [6, 7, 8]:
+        return "여름/휴가 시즌 프로모션"
+    elif month in [9, 10]:
+        return "가을/추석 시즌 프로모션"
+    return "연말/크리스마스 프로모션"
+
+
+def _plain(value):
+    # numpy 스칼라 → 파이썬 기본 타입 (레코드를 그대로 JSON 으로 내보낼 수 있게)
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def group_leaders(values, rows, groups, categories, dimension):
+    # (그룹 × 업종) 합계 배열에서 그룹마다 금액 1위 업종을 한 번의 argmax 로 고른다.
+    # 레코드가 없는 (그룹, 업종) 은 후보에서 빼고, 레코드가 없는 그룹은 건너뛴다 (동점이면 앞 업종).
+    values = np.asarray(values)
+    present = np.asarray(rows) > 0
+    masked = np.where(present, values, np.iinfo(np.int64).min if values.dtype.kind == 'i' else -np.inf)
+    leaders = masked.argmax(axis=1)
+    totals = np.where(present, values, 0).sum(axis=1)
+
+    records = []
+    for g in np.flatnonzero(present.any(axis=1)):
+        amount = values[g, leaders[g]]
+        records.append({
+            'dimension': dimension,
+            'group': _plain(groups[g]),
+            'category': _plain(categories[leaders[g]]),
+            'amount': _plain(amount),
+            'share': float(amount / totals[g] * 100) if totals[g] else 0.0,
+        })
+    return records
+
+
+def _decorate(dimension, record):
+    if dimension == '분기':
+        period, season, promotion = QUARTER_THEMES[record['group']]
+        record.update(period=period, season=season, promotion=promotion)
+    elif dimension == '월':
+        record['promotion'] = month_promotion(record['group'])
+    return record
+
+
+def category_leaders(cube, dims=LEADER_DIMS, by=SHARE_DIM, measure='카드이용금액계'):
+    # 연령대/성별/분기/월별 1위 업종 레코드를 {차원: [레코드]} 로 돌려준다.
+    # 큐브 롤업은 (연령대 × 성별 × 기준월 × 업종) 한 번뿐이고, 각 차원은 그 배열의 주변합
+    # (분기·월은 기준월 축을 행렬곱으로 묶은 것) 에서 argmax 로 계산한다.
+    base_dims = ['연령대', '성별', '기준월']
+    values, (ages, genders, months, categories) = cube.dense(base_dims + [by], measure)
+    rows, _ = cube.dense(base_dims + [by], ROW_COUNT)
+
+    marginals = {
+        '연령대': (values.sum(axis=(1, 2)), rows.sum(axis=(1, 2)), ages),
+        '성별': (values.sum(axis=(0, 2)), rows.sum(axis=(0, 2)), genders),
+    }
+    month_values, month_rows = values.sum(axis=(0, 1)), rows.sum(axis=(0, 1))
+    features = month_features(months)
+    for dim in ('월', '분기'):
+        keys = features[dim]
+        labels = sorted(set(keys.tolist()))
+        # 기준월 → 그룹 지시 행렬 [그룹 × 기준월]
+        indicator = (keys[None, :] == np.array(labels)[:, None]).astype(np.int64)
+        marginals[dim] = (indicator @ month_values, indicator @ month_rows, labels)
+
+    leaders = {}
+    for dim in dims:
+        dim_values, dim_rows, labels = marginals[dim]
+        leaders[dim] = [_decorate(dim, r) for r in group_leaders(dim_values, dim_rows, labels, categories, dim)]
+    return leaders
+
+
+def frame_leaders(frame, group, category, value):
+    # groupby([group, category])[value].sum().reset_index() 형태의 long 표에서 그룹별 1위 업종 레코드.
+    # (큐브가 없는 리포트 집계용, 그룹·업종 순서는 범주형이면 범주 순서, 아니면 정렬 순서)
+    group_codes, groups = pd.factorize(frame[group], sort=True)
+    category_codes, categories = pd.factorize(frame[category], sort=True)
+    values = np.zeros((len(groups), len(categories)), dtype=np.float64)
+    rows = np.zeros(values.shape, dtype=np.int64)
+    np.add.at(values, (group_codes, category_codes), frame[value].to_numpy(dtype=np.float64))
+    np.add.at(rows, (group_codes, category_codes), 1)
+    return group_leaders(values, rows, list(groups), list(categories), group)
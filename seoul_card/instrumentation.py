@@ -0,0 +1,209 @@
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 단계별 계측: with span('이름', rows=n): ... 으로 감싼 구간의 벽시계 시간, CPU 시간, 최대 RSS 증가량, 행 수를 기록한다.
+# 대시보드는 실행(rerun)마다 start_trace() 로 새 Tracer 를 만들고, 공용 모듈은 현재 Tracer 가 있을 때만 구간을 남긴다
+# (없으면 span 은 아무것도 재지 않는다). 결과는 표(frame)나 Chrome trace 이벤트 JSON(chrome://tracing, Perfetto)으로 본다.
+
+_current = contextvars.ContextVar('seoul_card_tracer', default=None)
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def _rss_bytes():
+    # 현재 RSS (Linux /proc, 그 밖에는 None)
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _peak_rss_bytes():
+    # 최대 RSS: Linux 는 /proc 의 VmHWM (재설정 가능), 그 밖에는 프로세스 전체 최댓값
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if os.uname().sysname == 'Darwin' else usage * 1024
+
+
+def _reset_peak_rss():
+    # VmHWM 을 현재 RSS 로 되돌린다 (Linux 4.0+). 안 되면 False - 최대 RSS 증가량은 프로세스 최댓값의 증가분이 된다
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+class Span:
+    # 계측 구간 하나. rows 와 attrs 는 구간 안에서 채워도 된다 (예: 필터 결과 행 수)
+
+    def __init__(self, name, depth=0, rows=None, attrs=None):
+        self.name = name
+        self.depth = depth
+        self.rows = rows
+        self.attrs = dict(attrs or {})
+        self.thread = threading.get_ident()
+        self.start = 0.0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.rss_start = None
+        self.peak_rss = None
+        self.peak_rss_delta = None
+
+
+class Tracer:
+    # 한 실행 동안의 계측 구간 모음. 구간은 끝난 순서로 쌓이고 표/trace 로 내보낼 때 시작 순서로 정렬한다.
+    # CPU 시간과 RSS 는 프로세스 단위이므로 다른 세션이 동시에 실행 중이면 그만큼 섞인다
+
+    def __init__(self, name='trace'):
+        self.name = name
+        self.origin = time.perf_counter()
+        self.spans = []
+        self._open = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._resettable = _reset_peak_rss()
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _fold_peak(self):
+        # 지금까지의 최대 RSS 를 열린 구간 전체에 반영한 뒤 VmHWM 을 재설정한다 (중첩 구간도 각자의 최댓값을 갖는다)
+        if not self._resettable:
+            return
+        peak = _peak_rss_bytes()
+        for span in self._open:
+            if peak is not None and span.peak_rss is not None:
+                span.peak_rss = max(span.peak_rss, peak)
+        _reset_peak_rss()
+
+    @contextlib.contextmanager
+    def span(self, name, rows=None, **attrs):
+        stack = self._stack()
+        span = Span(name, depth=len(stack), rows=rows, attrs=attrs)
+        with self._lock:
+            self._fold_peak()
+            span.rss_start = _rss_bytes() if self._resettable else _peak_rss_bytes()
+            span.peak_rss = span.rss_start
+            self._open.append(span)
+        stack.append(span)
+        cpu = time.process_time()
+        start = time.perf_counter()
+        span.start = start - self.origin
+        try:
+            yield span
+        finally:
+            span.wall = time.perf_counter() - start
+            span.cpu = time.process_time() - cpu
+            stack.pop()
+            with self._lock:
+                if self._resettable:
+                    self._fold_peak()
+                else:
+                    span.peak_rss = _peak_rss_bytes()
+                self._open.remove(span)
+                if span.peak_rss is not None and span.rss_start is not None:
+                    span.peak_rss_delta = max(span.peak_rss - span.rss_start, 0)
+                self.spans.append(span)
+
+    def annotate(self, **attrs):
+        # 현재 스레드에서 가장 안쪽에 열린 구간에 속성 추가
+        stack = self._stack()
+        if stack:
+            stack[-1].attrs.update(attrs)
+
+    def elapsed(self):
+        return time.perf_counter() - self.origin
+
+    def ordered(self):
+        return sorted(self.spans, key=lambda s: (s.start, s.depth))
+
+    def frame(self):
+        # 표시용 표: 시작 순서, 중첩 깊이만큼 들여 쓴 이름
+        rows = []
+        for span in self.ordered():
+            rows.append({
+                'span': '· ' * span.depth + span.name,
+                'wall_ms': round(span.wall * 1000, 1),
+                'cpu_ms': round(span.cpu * 1000, 1),
+                'peak_rss_delta_mb': None if span.peak_rss_delta is None else round(span.peak_rss_delta / 2**20, 1),
+                'rows': span.rows,
+                'attrs': ', '.join(f'{k}={v}' for k, v in span.attrs.items()),
+            })
+        frame = pd.DataFrame(rows, columns=['span', 'wall_ms', 'cpu_ms', 'peak_rss_delta_mb', 'rows', 'attrs'])
+        return frame.astype({'rows': 'Int64'})
+
+    def chrome_trace(self):
+        # Chrome trace event 형식 (완료 이벤트 'X', 마이크로초). chrome://tracing, Perfetto UI 에서 열 수 있다
+        pid = os.getpid()
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': self.name}}]
+        for span in self.ordered():
+            args = {'rows': span.rows, 'cpu_ms': round(span.cpu * 1000, 3),
+                    'peak_rss_delta_bytes': span.peak_rss_delta}
+            args.update({k: v if isinstance(v, (int, float, bool, type(None))) else str(v)
+                         for k, v in span.attrs.items()})
+            events.append({
+                'name': span.name,
+                'cat': 'seoul_card',
+                'ph': 'X',
+                'ts': round(span.start * 1e6, 3),
+                'dur': round(span.wall * 1e6, 3),
+                'pid': pid,
+                'tid': span.thread,
+                'args': args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def chrome_trace_json(self):
+        return json.dumps(self.chrome_trace(), ensure_ascii=False)
+
+
+def start_trace(name='trace'):
+    # 새 Tracer 를 현재 실행 컨텍스트의 Tracer 로 지정한다 (Streamlit 은 rerun 마다 호출)
+    tracer = Tracer(name)
+    _current.set(tracer)
+    return tracer
+
+
+def current_tracer():
+    return _current.get()
+
+
+@contextlib.contextmanager
+def span(name, rows=None, **attrs):
+    # 현재 Tracer 에 구간을 남긴다. Tracer 가 없으면 재지 않고 빈 Span 만 돌려준다
+    tracer = _current.get()
+    if tracer is None:
+        yield Span(name, rows=rows, attrs=attrs)
+        return
+    with tracer.span(name, rows=rows, **attrs) as current:
+        yield current
+
+
+def annotate(**attrs):
+    tracer = _current.get()
+    if tracer is not None:
+        tracer.annotate(**attrs)
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from seoul_card.data_cache import DEFAULT_CACHE_DIR
+from seoul_card.date_features import month_features
+from seoul_card.insights import month_promotion
+from seoul_card.shares import ShareTable
+
+# 디스크에 저장하는 캘린더 파일 형식 버전 (형식이 바뀌면 올린다)
+CALENDAR_VERSION = 2
+
+
+class MarketingCalendar:
+    # 연간 마케팅 캘린더: (월 × 업종) 소비 비중 행렬과 월별 1위 업종 위치만 담은 작은 결과물.
+    # 히트맵과 캘린더 표가 같은 배열에서 만들어진다. 1위 업종 위치가 -1 인 달은 레코드가 있는 업종이 없는 달이다.
+
+    def __init__(self, months, categories, shares, leaders):
+        self.months = [int(m) for m in months]
+        self.categories = list(categories)
+        self.shares = np.asarray(shares, dtype=np.float64).reshape(len(self.months), len(self.categories))
+        self.leaders = np.asarray(leaders, dtype=np.intp)
+
+    @classmethod
+    def from_share_table(cls, table, months=None):
+        # 비중 표의 선택된 기준월 행을 달(1~12월)별로 더해 만든다 (원본 행·큐브를 다시 보지 않음)
+        rows = table._rows(months)
+        amounts = table.amounts[rows].astype(np.float64)
+        counts = table.counts[rows]
+        month_numbers = month_features([table.months[i] for i in rows])['월']
+        labels = sorted(set(month_numbers.tolist()))
+        indicator = (month_numbers[None, :] == np.array(labels, dtype=np.int64)[:, None]).astype(np.float64)
+        amounts = indicator @ amounts
+        counts = indicator @ counts
+
+        # 선택 기간에 레코드가 있는 업종만, 달마다 합이 1이 되도록 정규화
+        columns = np.flatnonzero(counts.sum(axis=0) > 0)
+        amounts, counts = amounts[:, columns], counts[:, columns]
+        totals = amounts.sum(axis=1, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shares = np.where(totals > 0, amounts / totals, 0.0)
+        # 월별 1위 업종 (그 달에 레코드가 있는 업종 중, 동점이면 앞 업종). 그런 업종이 없는 달은 -1
+        leaders = np.full(len(labels), -1, dtype=np.intp)
+        if len(columns):
+            has_records = (counts > 0).any(axis=1)
+            best = np.where(counts > 0, amounts, -np.inf).argmax(axis=1)
+            leaders[has_records] = best[has_records]
+        return cls(labels, [table.categories[j] for j in columns], shares, leaders)
+
+    @classmethod
+    def from_cube(cls, cube):
+        return cls.from_share_table(ShareTable.from_cube(cube))
+
+    def heatmap(self):
+        # 행: 업종, 열: 월, 값: 그 달 안에서의 소비 비중 (합 1)
+        return pd.DataFrame(
+            self.shares.T,
+            index=pd.Index(self.categories, name='온라인업종'),
+            columns=pd.Index(self.months, name='월'),
+        )
+
+    def calendar_table(self):
+        # 월별 인기 업종과 추천 프로모션
+        return pd.DataFrame({
+            '월': self.months,
+            '월_표시': [f'{m}월' for m in self.months],
+            '인기업종': [self.categories[j] if j >= 0 else None for j in self.leaders],
+            '추천프로모션': [month_promotion(m) for m in self.months],
+        })
+
+    def save(self, path):
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz'
+        np.savez(tmp_path, months=np.array(self.months), categories=np.array(self.categories),
+                 shares=self.shares, leaders=self.leaders)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['months'], data['categories'].tolist(), data['shares'], data['leaders'])
+
+
+class CalendarStore:
+    # 데이터셋에서 파생된 캘린더 저장소. 선택 기준월 묶음마다 캘린더를 한 번만 만든다.
+    # - 메모리: 선택 기준월 → 캘린더. append/refresh 로 바뀐 기준월을 포함하는 항목만 버린다.
+    # - 디스크: 선택된 모든 기준월에 파티션 식별자가 있으면(Parquet 데이터셋) .npz 로 저장해
+    #   프로세스를 재시작해도 다시 계산하지 않는다.
+
+    def __init__(self, share_table, dataset=None, cache_dir=DEFAULT_CACHE_DIR):
+        self.table = share_table
+        self.dataset = dataset
+        self.cache_dir = cache_dir
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_dataset(cls, dataset):
+        # 비중 표를 먼저 구독시켜 append 알림이 비중 표 → 캘린더 순서로 전달되게 한다
+        return cls(dataset.derived('share_table', ShareTable.from_dataset), dataset)
+
+    def _disk_path(self, months):
+        if not self.cache_dir or self.dataset is None:
+            return None
+        digest = hashlib.sha1(f'v{CALENDAR_VERSION};'.encode('utf-8'))
+        for month in months:
+            signature = self.dataset.month_signature(month)
+            if signature is None:
+                return None
+            digest.update(f'{signature};'.encode('utf-8'))
+        return os.path.join(self.cache_dir, f'calendar-{digest.hexdigest()}.npz')
+
+    def get(self, months):
+        key = tuple(months)
+        with self._lock:
+            calendar = self._memory.get(key)
+        if calendar is not None:
+            return calendar
+
+        path = self._disk_path(key)
+        if path is not None and os.path.exists(path):
+            try:
+                calendar = MarketingCalendar.load(path)
+            except Exception:
+                # 손상된 파일은 버리고 다시 계산
+                os.remove(path)
+        if calendar is None:
+            calendar = MarketingCalendar.from_share_table(self.table, key)
+            if path is not None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                calendar.save(path)
+        with self._lock:
+            self._memory[key] = calendar
+        return calendar
+
+    def on_append(self, dataset, months):
+        changed = set(months)
+        with self._lock:
+            for key in [k for k in self._memory if changed.intersection(k)]:
+                del self._memory[key]
@@ -0,0 +1,206 @@
+import copy
+import threading
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from seoul_card.aggregate_cube import AggregateCube
+from seoul_card.date_features import month_features
+from seoul_card.engine import AggregationEngine, bounded_map
+from seoul_card.schema import ONLINE_SCHEMA, add_time_columns, coerce_online
+
+PARTITION_KEY = '기준월'
+
+
+def split_by_month(df, key=PARTITION_KEY):
+    # 기준월 코드로 한 번 정렬해 연속 구간을 파티션으로 자른다 (행 스캔은 이 한 번뿐)
+    if isinstance(df[key].dtype, pd.CategoricalDtype):
+        codes = df[key].cat.codes.to_numpy()
+        labels = list(df[key].cat.categories)
+    else:
+        codes, uniques = pd.factorize(df[key], sort=True)
+        labels = list(uniques)
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+    bounds = np.concatenate([[0], np.cumsum(counts)]) + int((codes < 0).sum())
+
+    frames = {}
+    for code, label in enumerate(labels):
+        start, stop = bounds[code], bounds[code + 1]
+        if stop > start:
+            frames[str(label)] = df.take(order[start:stop]).reset_index(drop=True)
+    return frames
+
+
+class PartitionedDataset:
+    # 기준월 단위 파티션 데이터셋의 공통 동작.
+    # select()는 파티션 목록만 줄인 뷰를 돌려주므로 행을 훑거나 복사하지 않고,
+    # 큐브는 파티션별로 한 번만 만들어 선택된 파티션 것만 합친다.
+    # append()는 새 기준월 행만 집계해 해당 파티션 큐브에 더하고, 등록된 파생 집계에 바뀐 기준월을 알린다.
+
+    # 파티션 큐브를 동시에 만드는 작업 수 (None 이면 engine.DEFAULT_WORKERS)
+    workers = None
+
+    def __init__(self, months):
+        self.months = sorted(months)
+        self._partition_cubes = {}
+        # 기준월별 내용 세대: append/refresh 로 파티션이 바뀔 때마다 올라간다 (잠금 밖에서 만든 큐브의 유효성 확인용)
+        self._generations = {}
+        self._derived = {}
+        self._subscribers = []
+        self._lock = threading.RLock()
+        # 화면 계산 캐시 키: 데이터셋 인스턴스 식별자 + append/refresh 때마다 올라가는 버전
+        self.token = uuid.uuid4().hex
+        self.version = 0
+
+    @property
+    def years(self):
+        return sorted(set(month_features(self.months)['연도'].tolist()))
+
+    def read_partition(self, month):
+        raise NotImplementedError
+
+    def partition_rows(self, month):
+        raise NotImplementedError
+
+    def _store_partition(self, month, rows):
+        raise NotImplementedError
+
+    def month_signature(self, month):
+        # 프로세스를 넘어 유지되는 파티션 내용 식별자 (디스크 캐시 키용), 없으면 None
+        return None
+
+    def select(self, years=None, months=None):
+        selected = self.months
+        if years is not None:
+            keep = np.isin(month_features(selected)['연도'], [int(y) for y in years])
+            selected = [m for m, k in zip(selected, keep) if k]
+        if months is not None:
+            months = set(months)
+            selected = [m for m in selected if m in months]
+        # 얕은 복사: 파티션 저장소와 파티션 큐브 캐시는 원본과 공유 (파생 집계는 원본 전체 기준이므로 공유하지 않음)
+        view = copy.copy(self)
+        view.months = selected
+        view._derived = {}
+        view._subscribers = []
+        return view
+
+    def cache_key(self):
+        # (데이터셋, 버전, 선택된 기준월) - 같은 키면 같은 큐브이므로 파생 계산 결과를 재사용할 수 있다
+        return self.token, self.version, tuple(self.months)
+
+    def iter_partitions(self, months=None):
+        for month in (self.months if months is None else months):
+            yield month, self.read_partition(month)
+
+    def read(self, months=None):
+        # 선택된 파티션만 이어 붙인다 (비용은 선택된 행 수에 비례)
+        frames = [df for _, df in self.iter_partitions(months)]
+        if not frames:
+            return coerce_online(pd.DataFrame({col: pd.Series(dtype=object) for col in ONLINE_SCHEMA}))
+        return coerce_online(pd.concat(frames, ignore_index=True))
+
+    @property
+    def n_rows(self):
+        return sum(self.partition_rows(m) for m in self.months)
+
+    def partition_cube(self, month):
+        # 추가(append)와 겹쳐 오래된 큐브로 덮어쓰지 않도록 잠금 안에서 만든다
+        with self._lock:
+            cube = self._partition_cubes.get(month)
+            if cube is None:
+                cube = AggregateCube.from_frame(self.read_partition(month), labels={PARTITION_KEY: [month]})
+                self._partition_cubes[month] = cube
+            return cube
+
+    def _prefetch_cube(self, month):
+        # 잠금 밖에서 파티션을 읽고 집계한 뒤, 그 사이 파티션이 바뀌지 않았을 때만 저장한다
+        with self._lock:
+            generation = self._generations.get(month, 0)
+        cube = AggregateCube.from_frame(self.read_partition(month), labels={PARTITION_KEY: [month]})
+        with self._lock:
+            if self._generations.get(month, 0) == generation:
+                self._partition_cubes.setdefault(month, cube)
+
+    def cube(self):
+        # 선택된 기준월 파티션의 큐브만 기준월 축으로 이어 붙인다.
+        # 아직 없는 파티션 큐브는 여러 파티션을 동시에 읽어 만든다 (Parquet 읽기는 GIL 을 놓는다)
+        if not self.months:
+            return AggregateCube.empty()
+        missing = [m for m in self.months if m not in self._partition_cubes]
+        if len(missing) > 1:
+            for _ in bounded_map(self._prefetch_cube, missing, self.workers):
+                pass
+        return AggregateCube.merge(self.partition_cube(m) for m in self.months)
+
+    def aggregate(self, by, measures=('카드이용금액계', '카드이용건수'), stats=('sum', 'count', 'mean')):
+        # 큐브에 없는 그룹 차원 조합도 선택된 파티션을 하나씩 스캔해 집계한다 (메모리는 동시에 읽는 파티션 수만큼)
+        return AggregationEngine(self, workers=self.workers).aggregate(by, list(measures), list(stats))
+
+    def build_cube(self, months=None):
+        return (self if months is None else self.select(months=months)).cube()
+
+    def derived(self, name, factory):
+        # 데이터셋 전체에서 파생된 집계(업종 비중 표 등)를 한 번만 만든다.
+        # on_append(dataset, months) 메서드가 있으면 append/refresh 때 바뀐 기준월만 전달받아 갱신한다.
+        with self._lock:
+            if name not in self._derived:
+                value = factory(self)
+                self._derived[name] = value
+                if hasattr(value, 'on_append'):
+                    self._subscribers.append(value.on_append)
+            return self._derived[name]
+
+    def _notify(self, months):
+        if months:
+            for callback in list(self._subscribers):
+                callback(self, months)
+
+    def append(self, df):
+        # 새로 도착한 기준월 행을 저장하고 그 기준월의 파티션 큐브만 증분 갱신한다.
+        # 이미 있는 기준월이면 기존 행에 덧붙이며, 바뀐 기준월 목록을 돌려준다.
+        df = add_time_columns(coerce_online(df))
+        affected = []
+        with self._lock:
+            for month, rows in split_by_month(df).items():
+                delta = AggregateCube.from_frame(rows, labels={PARTITION_KEY: [month]})
+                self._store_partition(month, rows)
+                self._generations[month] = self._generations.get(month, 0) + 1
+                if month in self.months:
+                    # 기존 큐브가 아직 없으면 다음 요청 때 파티션 전체로 만들어진다
+                    cube = self._partition_cubes.get(month)
+                    if cube is not None:
+                        self._partition_cubes[month] = AggregateCube.merge([cube, delta])
+                else:
+                    self.months = sorted(self.months + [month])
+                    self._partition_cubes[month] = delta
+                affected.append(month)
+            if affected:
+                self.version += 1
+        self._notify(affected)
+        return affected
+
+
+class MemoryPartitions(PartitionedDataset):
+    # 메모리 상의 기준월별 데이터프레임 묶음
+
+    def __init__(self, frames):
+        super().__init__(frames.keys())
+        self._frames = frames
+
+    @classmethod
+    def from_frame(cls, df, key=PARTITION_KEY):
+        return cls(split_by_month(df, key))
+
+    def read_partition(self, month):
+        return self._frames[month]
+
+    def partition_rows(self, month):
+        return len(self._frames[month])
+
+    def _store_partition(self, month, rows):
+        existing = self._frames.get(month)
+        if existing is not None:
+            rows = coerce_online(pd.concat([existing, rows], ignore_index=True))
+        self._frames[month] = rows
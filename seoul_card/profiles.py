@@ -0,0 +1,66 @@
+import pandas as pd
+
+from seoul_card.aggregate_cube import ROW_COUNT
+from seoul_card.shares import SHARE_DIM, top_k
+
+# 업종별로 보관하는 상위 행정동 수
+TOP_DISTRICTS = 10
+
+PROFILE_DIMS = ['연령대', '성별', '고객행정동코드']
+
+
+def _marginal(values, rows, labels, name):
+    # 레코드가 있는 라벨만 남긴 Series (cube.series(dim) 과 같은 형태)
+    keep = rows > 0
+    return pd.Series(values[keep], index=pd.Index([l for l, k in zip(labels, keep) if k], name=name),
+                     name='카드이용금액계')
+
+
+class CategoryProfiles:
+    # 업종별 소비자 구성(연령대·성별 분포, 상위 행정동)을 큐브 롤업 한 번으로 미리 만들어 둔다.
+    # 인사이트 화면은 업종마다 큐브를 다시 자르고 롤업하는 대신 profiles[업종] 딕셔너리 조회만 한다.
+
+    def __init__(self, profiles):
+        self._profiles = profiles
+
+    @classmethod
+    def from_cube(cls, cube, by=SHARE_DIM, top_districts=TOP_DISTRICTS):
+        values, labels = cube.dense([by] + PROFILE_DIMS)
+        rows, _ = cube.dense([by] + PROFILE_DIMS, ROW_COUNT)
+        categories, ages, genders, districts = labels
+
+        # (업종 × 차원) 주변합: 나머지 축만 더한다
+        age_values, age_rows = values.sum(axis=(2, 3)), rows.sum(axis=(2, 3))
+        gender_values, gender_rows = values.sum(axis=(1, 3)), rows.sum(axis=(1, 3))
+        district_values, district_rows = values.sum(axis=(1, 2)), rows.sum(axis=(1, 2))
+
+        profiles = {}
+        for i, category in enumerate(categories):
+            if age_rows[i].sum() == 0:
+                continue
+            age = _marginal(age_values[i], age_rows[i], ages, '연령대')
+            gender = _marginal(gender_values[i], gender_rows[i], genders, '성별')
+            district = _marginal(district_values[i], district_rows[i], districts, '고객행정동코드')
+            district = district.iloc[top_k(district.to_numpy(), top_districts)]
+            profiles[category] = {
+                'total': int(age_values[i].sum()),
+                'age': age,
+                'gender': gender,
+                'districts': district,
+                'top_age': age.idxmax(),
+                'top_gender': gender.idxmax() if len(gender) > 0 else None,
+            }
+        return cls(profiles)
+
+    def __getitem__(self, category):
+        return self._profiles[category]
+
+    def __contains__(self, category):
+        return category in self._profiles
+
+    def get(self, category, default=None):
+        return self._profiles.get(category, default)
+
+    @property
+    def categories(self):
+        return list(self._profiles)
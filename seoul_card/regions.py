@@ -0,0 +1,108 @@
+import pandas as pd
+
+from seoul_card.schema import ADMIN_CODES
+
+REGION_DIM = '고객행정동코드'
+
+SEOUL_CITY_CODE = 11
+SEOUL_CITY = '서울특별시'
+
+# 서울시 자치구: (시군구 코드, 이름, 구청 위치 위도, 경도)
+SEOUL_GU = [
+    (11110, '종로구', 37.5735, 126.9790),
+    (11140, '중구', 37.5638, 126.9976),
+    (11170, '용산구', 37.5326, 126.9905),
+    (11200, '성동구', 37.5634, 127.0370),
+    (11215, '광진구', 37.5385, 127.0824),
+    (11230, '동대문구', 37.5744, 127.0396),
+    (11260, '중랑구', 37.6063, 127.0926),
+    (11290, '성북구', 37.5894, 127.0167),
+    (11305, '강북구', 37.6397, 127.0255),
+    (11320, '도봉구', 37.6688, 127.0471),
+    (11350, '노원구', 37.6542, 127.0568),
+    (11380, '은평구', 37.6027, 126.9291),
+    (11410, '서대문구', 37.5791, 126.9368),
+    (11440, '마포구', 37.5663, 126.9019),
+    (11470, '양천구', 37.5170, 126.8665),
+    (11500, '강서구', 37.5510, 126.8496),
+    (11530, '구로구', 37.4954, 126.8875),
+    (11545, '금천구', 37.4569, 126.8955),
+    (11560, '영등포구', 37.5264, 126.8963),
+    (11590, '동작구', 37.5124, 126.9393),
+    (11620, '관악구', 37.4784, 126.9516),
+    (11650, '서초구', 37.4837, 127.0324),
+    (11680, '강남구', 37.5172, 127.0473),
+    (11710, '송파구', 37.5145, 127.1059),
+    (11740, '강동구', 37.5301, 127.1238),
+]
+GU_BY_CODE = {code: (name, lat, lon) for code, name, lat, lon in SEOUL_GU}
+
+UNKNOWN_GU = '미상'
+
+# 지역 집계 단위 (행정동 → 구 → 시)
+REGION_LEVELS = ['행정동', '구', '시']
+
+
+def gu_code_of(dong_code):
+    # 행정동 코드(정수 또는 문자열) → 상위 자치구 시군구 코드, 알 수 없으면 None.
+    # 실제 행정동 코드(8자리 이상)는 앞 5자리가 시군구 코드이다.
+    # 샘플 데이터의 5자리 코드(11001~11050)는 실제 코드가 아니므로 자치구 순서대로 2개씩 배정한다.
+    digits = str(dong_code).strip()
+    if not digits.isdigit():
+        return None
+    code = int(digits)
+    digits = str(code)
+    if len(digits) >= 8:
+        gu_code = int(digits[:5])
+        return gu_code if gu_code in GU_BY_CODE else None
+    if len(digits) == 5 and code // 1000 == SEOUL_CITY_CODE:
+        sequence = code % 1000
+        if 1 <= sequence <= 2 * len(SEOUL_GU):
+            return SEOUL_GU[(sequence - 1) // 2][0]
+    return None
+
+
+def region_table(codes=ADMIN_CODES):
+    # 정수 행정동 코드를 인덱스로 하는 지역 차원 표: 구코드, 구, 시코드, 시, 위도, 경도 (구청 위치)
+    rows = []
+    for code in codes:
+        gu_code = gu_code_of(code)
+        name, lat, lon = GU_BY_CODE.get(gu_code, (UNKNOWN_GU, None, None))
+        rows.append({
+            '행정동코드': int(code) if str(code).strip().isdigit() else code,
+            '구코드': gu_code,
+            '구': name,
+            '시코드': SEOUL_CITY_CODE if gu_code is not None else None,
+            '시': SEOUL_CITY if gu_code is not None else UNKNOWN_GU,
+            '위도': lat,
+            '경도': lon,
+        })
+    return pd.DataFrame(rows).set_index('행정동코드')
+
+
+def region_mapping(codes, level):
+    # 행정동 코드 라벨 → level 단위 라벨 ('행정동' 이면 그대로)
+    if level == '행정동':
+        return {code: code for code in codes}
+    table = region_table(codes)
+    return dict(zip(codes, table[level]))
+
+
+def region_cube(cube, level):
+    # 큐브의 고객행정동코드 축을 level 단위(구/시)로 미리 합친 큐브.
+    # 축 이름은 그대로 두고 라벨만 구/시 이름이 되므로 행정동 화면 계산을 그대로 재사용할 수 있다.
+    if level == '행정동':
+        return cube
+    order = [name for _, name, _, _ in SEOUL_GU] if level == '구' else [SEOUL_CITY]
+    return cube.regroup(REGION_DIM, region_mapping(cube.labels[REGION_DIM], level), order=order + [UNKNOWN_GU])
+
+
+class RegionRollups:
+    # 지역 단위별(행정동/구/시) 큐브를 한 번에 만들어 두고, 화면은 단위를 바꿀 때 조회만 한다
+    # (원본 거래를 다시 훑지 않음)
+
+    def __init__(self, cube, levels=REGION_LEVELS):
+        self.cubes = {level: region_cube(cube, level) for level in levels}
+
+    def __getitem__(self, level):
+        return self.cubes[level]
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+from seoul_card.date_features import day_dates, day_features, month_features
+from seoul_card.schema import (
+    ADMIN_CODES, AGE_GROUPS, BASE_MONTHS, CATEGORIES, DISTRICTS, GENDERS, N_CUSTOMERS,
+    ONLINE_CATEGORIES, ONLINE_SCHEMA, TRANSACTION_SCHEMA,
+)
+
+# 생성 로직이 바뀌면 올려서 캐시된 데이터셋을 무효화한다
+GENERATOR_VERSION = 2
+
+START_DATE = np.datetime64('2021-01-01')
+END_DATE = np.datetime64('2023-12-31')
+
+# 업종별 금액/건수 범위 (양 끝 포함): 전자기기·여행 > 배달앱 > 기본 > 구독형
+_ONLINE_DEFAULT_RANGE = ((20000, 300000), (1, 8))
+_ONLINE_RANGES = {
+    '전자기기': ((100000, 1000000), (1, 5)),
+    '여행/교통': ((100000, 1000000), (1, 5)),
+    '온라인게임': ((10000, 50000), (1, 10)),
+    '스트리밍서비스': ((10000, 50000), (1, 10)),
+    '정기구독': ((10000, 50000), (1, 10)),
+    '배달앱': ((15000, 100000), (3, 15)),
+}
+
+_OFFLINE_DEFAULT_RANGE = (5000, 150000)
+_OFFLINE_RANGES = {
+    '마트/슈퍼': (10000, 100000),
+    '패션': (30000, 300000),
+    '가전/전자': (30000, 300000),
+    '음식점': (5000, 50000),
+    '카페': (5000, 50000),
+    '교육': (50000, 500000),
+}
+
+
+def _from_codes(codes, dtype):
+    return pd.Categorical.from_codes(codes, dtype=dtype)
+
+
+def make_rng(seed=None):
+    # seed가 None이면 매번 다른 데이터, 정수이면 재현 가능한 데이터
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def generate_online_card_data(n_samples=10000, seed=None):
+    # 대시보드용 온라인 카드소비 데이터를 열 단위로 한 번에 생성한다
+    rng = make_rng(seed)
+
+    month_codes = rng.integers(0, len(BASE_MONTHS), n_samples)
+    category_codes = rng.integers(0, len(ONLINE_CATEGORIES), n_samples)
+    admin_codes = rng.integers(0, len(ADMIN_CODES), n_samples)
+    age_codes = rng.integers(0, len(AGE_GROUPS), n_samples)
+    gender_codes = rng.integers(0, len(GENDERS), n_samples)
+
+    # 업종별 금액 범위 차등화
+    amount_bounds = np.array([_ONLINE_RANGES.get(c, _ONLINE_DEFAULT_RANGE)[0] for c in ONLINE_CATEGORIES])
+    count_bounds = np.array([_ONLINE_RANGES.get(c, _ONLINE_DEFAULT_RANGE)[1] for c in ONLINE_CATEGORIES])
+    amounts = rng.integers(amount_bounds[category_codes, 0], amount_bounds[category_codes, 1] + 1)
+    transactions = rng.integers(count_bounds[category_codes, 0], count_bounds[category_codes, 1] + 1)
+
+    # 기준월 라벨별 연도/월 조회표를 기준월 코드로 인덱싱
+    base_month_features = month_features(BASE_MONTHS)
+    month_of_year = base_month_features['월'][month_codes]
+
+    # 계절적 효과: 여름에는 배달앱, 겨울에는 생활쇼핑 증가
+    summer_delivery = (category_codes == ONLINE_CATEGORIES.index('배달앱')) & np.isin(month_of_year, [6, 7, 8])
+    amounts = np.where(summer_delivery, (amounts * 1.3).astype(np.int64), amounts)
+    winter_shopping = (category_codes == ONLINE_CATEGORIES.index('생활쇼핑')) & np.isin(month_of_year, [11, 12, 1])
+    amounts = np.where(winter_shopping, (amounts * 1.4).astype(np.int64), amounts)
+
+    # 코로나 효과 (2021년은 더 높은 온라인 소비)
+    year_2021 = month_codes < 12
+    amounts = np.where(year_2021, (amounts * 1.2).astype(np.int64), amounts)
+
+    # 후처리: 거래액이 0원인 레코드 제거
+    keep = amounts > 0
+    if not keep.all():
+        month_codes, category_codes, admin_codes = month_codes[keep], category_codes[keep], admin_codes[keep]
+        age_codes, gender_codes = age_codes[keep], gender_codes[keep]
+        transactions, amounts = transactions[keep], amounts[keep]
+
+    # 범주 코드로 바로 범주형 열을 만들고, 연도/월은 기준월 코드로 조회
+    return pd.DataFrame({
+        '기준월': _from_codes(month_codes, ONLINE_SCHEMA['기준월']),
+        '온라인업종': _from_codes(category_codes, ONLINE_SCHEMA['온라인업종']),
+        '고객행정동코드': _from_codes(admin_codes, ONLINE_SCHEMA['고객행정동코드']),
+        '연령대': _from_codes(age_codes, ONLINE_SCHEMA['연령대']),
+        '성별': _from_codes(gender_codes, ONLINE_SCHEMA['성별']),
+        '카드이용건수': transactions.astype(ONLINE_SCHEMA['카드이용건수']),
+        '카드이용금액계': amounts.astype(ONLINE_SCHEMA['카드이용금액계']),
+        '연도': base_month_features['연도'].astype(ONLINE_SCHEMA['연도'])[month_codes],
+        '월': month_of_year.astype(ONLINE_SCHEMA['월']),
+    })
+
+
+def generate_transaction_data(n_samples=10000, seed=None):
+    # app.py / 분석 스크립트용 오프라인 거래 데이터를 열 단위로 한 번에 생성한다
+    rng = make_rng(seed)
+
+    date_range = int((END_DATE - START_DATE).astype(int))
+    day_offsets = rng.integers(0, date_range + 1, n_samples)
+    customer_codes = rng.integers(0, N_CUSTOMERS, n_samples)
+    category_codes = rng.integers(0, len(CATEGORIES), n_samples)
+    district_codes = rng.integers(0, len(DISTRICTS), n_samples)
+    age_codes = rng.integers(0, len(AGE_GROUPS), n_samples)
+    gender_codes = rng.integers(0, len(GENDERS), n_samples)
+
+    # 업종별 금액 범위 차등화
+    amount_bounds = np.array([_OFFLINE_RANGES.get(c, _OFFLINE_DEFAULT_RANGE) for c in CATEGORIES])
+    amounts = rng.integers(amount_bounds[category_codes, 0], amount_bounds[category_codes, 1] + 1)
+
+    return pd.DataFrame({
+        'transaction_id': np.arange(1, n_samples + 1, dtype=TRANSACTION_SCHEMA['transaction_id']),
+        'date': day_dates(day_offsets, START_DATE),
+        'customer_id': _from_codes(customer_codes, TRANSACTION_SCHEMA['customer_id']),
+        'category': _from_codes(category_codes, TRANSACTION_SCHEMA['category']),
+        'district': _from_codes(district_codes, TRANSACTION_SCHEMA['district']),
+        'age_group': _from_codes(age_codes, TRANSACTION_SCHEMA['age_group']),
+        'gender': _from_codes(gender_codes, TRANSACTION_SCHEMA['gender']),
+        'amount': amounts.astype(TRANSACTION_SCHEMA['amount']),
+        # 날짜 파생 변수: 날짜별 조회표를 일 오프셋으로 인덱싱 (.dt 재계산 없음)
+        **day_features(day_offsets, START_DATE, END_DATE, TRANSACTION_SCHEMA),
+    })
+
+
+def add_calendar_labels(df):
+    # app.py 스키마: 요일 이름(월요일 먼저인 순서형 범주)과 계절 범주를 요일/분기 코드에서 만든다
+    df['day_name'] = pd.Categorical.from_codes(df['day_of_week'], dtype=TRANSACTION_SCHEMA['day_name'])
+    df['season'] = pd.Categorical.from_codes(df['quarter'] - 1, dtype=TRANSACTION_SCHEMA['season'])
+    return df
@@ -0,0 +1,174 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from seoul_card.date_features import date_columns, month_features
+
+# 온라인 업종 정의 (대시보드)
+ONLINE_CATEGORIES = [
+    '간편식/건강식품', '교육/학습', '도서/음반', '문화/예술',
+    '미용/뷰티', '배달앱', '생활쇼핑', '스트리밍서비스',
+    '여행/교통', '온라인게임', '의류/패션', '전자기기',
+    '정기구독', '홈인테리어'
+]
+
+# 행정동 코드 (서울시 행정동 코드 형식)
+ADMIN_CODES = [f'11{i:03d}' for i in range(1, 51)]
+
+# 기준월 (2021-01 ~ 2023-12)
+BASE_MONTHS = [f"{year}{month:02d}" for year in range(2021, 2024) for month in range(1, 13)]
+
+AGE_GROUPS = ['20대', '30대', '40대', '50대', '60대 이상']
+GENDERS = ['남성', '여성']
+
+# 오프라인 거래 업종 및 지역 정의 (app.py, 분석 스크립트)
+CATEGORIES = [
+    '음식점', '카페', '패션', '마트/슈퍼', '교통', '문화/여가', '미용',
+    '의료', '교육', '가전/전자', '스포츠/레저', '주유', '숙박', '기타'
+]
+
+DISTRICTS = [
+    '강남구', '서초구', '송파구', '종로구', '중구', '용산구', '마포구',
+    '영등구', '성동구', '광진구', '동대문구', '성북구', '강북구', '도봉구',
+    '노원구', '은평구', '서대문구', '강서구', '양천구', '구로구', '금천구',
+    '영등포구', '동작구', '관악구', '강동구'
+]
+
+N_CUSTOMERS = 500
+CUSTOMER_IDS = [f'CUST_{i:05d}' for i in range(1, N_CUSTOMERS + 1)]
+
+DAY_NAMES = ['월요일', '화요일', '수요일', '목요일', '금요일', '토요일', '일요일']
+SEASONS = ['1분기(겨울-봄)', '2분기(봄-여름)', '3분기(여름-가을)', '4분기(가을-겨울)']
+
+# 대시보드 데이터 스키마: 고정 순서 범주형 + 작은 정수형
+ONLINE_SCHEMA = {
+    '기준월': pd.CategoricalDtype(BASE_MONTHS, ordered=True),
+    '온라인업종': pd.CategoricalDtype(ONLINE_CATEGORIES),
+    '고객행정동코드': pd.CategoricalDtype(ADMIN_CODES),
+    '연령대': pd.CategoricalDtype(AGE_GROUPS, ordered=True),
+    '성별': pd.CategoricalDtype(GENDERS),
+    '카드이용건수': np.dtype('int32'),
+    '카드이용금액계': np.dtype('int32'),
+    '연도': np.dtype('int16'),
+    '월': np.dtype('int8'),
+}
+
+# app.py / 분석 스크립트 거래 데이터 스키마 (transaction_id는 일련번호 정수)
+TRANSACTION_SCHEMA = {
+    'transaction_id': np.dtype('int32'),
+    'date': np.dtype('datetime64[ns]'),
+    'customer_id': pd.CategoricalDtype(CUSTOMER_IDS),
+    'category': pd.CategoricalDtype(CATEGORIES),
+    'district': pd.CategoricalDtype(DISTRICTS),
+    'age_group': pd.CategoricalDtype(AGE_GROUPS, ordered=True),
+    'gender': pd.CategoricalDtype(GENDERS),
+    'amount': np.dtype('int32'),
+    'year': np.dtype('int16'),
+    'month': np.dtype('int8'),
+    'day': np.dtype('int8'),
+    'day_of_week': np.dtype('int8'),
+    'quarter': np.dtype('int8'),
+    'day_name': pd.CategoricalDtype(DAY_NAMES, ordered=True),
+    'season': pd.CategoricalDtype(SEASONS, ordered=True),
+}
+
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+def _coerce_column(series, dtype):
+    if isinstance(dtype, pd.CategoricalDtype):
+        if isinstance(series.dtype, pd.CategoricalDtype) and series.dtype == dtype:
+            return series
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype(object)
+        elif not pd.api.types.is_string_dtype(series):
+            series = series.astype(str)
+        unknown = pd.Index(series.dropna().unique()).difference(dtype.categories)
+        if len(unknown):
+            # 고정 목록에 없는 값(실데이터의 신규 행정동 등)은 정렬해서 뒤에 덧붙인다
+            dtype = pd.CategoricalDtype(list(dtype.categories) + sorted(unknown), ordered=dtype.ordered)
+        return series.astype(dtype)
+    if dtype == np.dtype('int32') and len(series) and series.max() > _INT32_MAX:
+        # int32 범위를 넘는 금액은 int64로 유지
+        return series.astype(np.int64)
+    return series.astype(dtype)
+
+
+def coerce_schema(df, schema):
+    # 스키마에 정의된 열만 지정 dtype으로 변환 (나머지 열은 그대로)
+    converted = {col: _coerce_column(df[col], dtype) for col, dtype in schema.items() if col in df.columns}
+    return df.assign(**converted)
+
+
+def coerce_online(df):
+    return coerce_schema(df, ONLINE_SCHEMA)
+
+
+def add_time_columns(df):
+    # 기준월 범주별 연도/월 조회표를 범주 코드로 인덱싱 (라벨 변환은 범주 수만큼만)
+    base_month = df['기준월']
+    features = month_features(base_month.cat.categories)
+    codes = base_month.cat.codes.to_numpy()
+    years = features['연도'].astype(ONLINE_SCHEMA['연도'])
+    months = features['월'].astype(ONLINE_SCHEMA['월'])
+    return df.assign(연도=years[codes], 월=months[codes])
+
+
+def coerce_transactions(df):
+    return coerce_schema(df, TRANSACTION_SCHEMA)
+
+
+def prepare_transactions(df):
+    # 파일에서 읽은 거래 청크: compact 스키마로 변환하고 date 열에서 연도/월/일/요일/분기를 다시 계산
+    df = coerce_transactions(df.dropna(subset=['date', 'amount']))
+    return df.assign(**date_columns(df['date'].to_numpy(), TRANSACTION_SCHEMA))
+
+
+def to_object_schema(df):
+    # 비교용 기존(object) 스키마: 문자열 범주, 문자열 연도/월/거래ID, int64 금액
+    converted = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            converted[col] = series.astype(object)
+        elif col == '연도':
+            converted[col] = series.astype(str).astype(object)
+        elif col == '월':
+            converted[col] = series.astype(str).str.zfill(2).astype(object)
+        elif col == 'transaction_id':
+            converted[col] = ('TX_' + series.astype(str).str.zfill(7)).astype(object)
+        elif pd.api.types.is_integer_dtype(series):
+            converted[col] = series.astype(np.int64)
+    return df.assign(**converted)
+
+
+def memory_report(sizes=(1_000_000, 10_000_000), seed=0):
+    # object 스키마와 compact 스키마의 메모리 사용량 비교 (deep 측정)
+    from seoul_card.sample_data import generate_online_card_data, generate_transaction_data
+
+    rows = []
+    for name, generator in [('online', generate_online_card_data), ('transaction', generate_transaction_data)]:
+        for n_rows in sizes:
+            compact = generator(n_rows, seed=seed)
+            compact_bytes = int(compact.memory_usage(index=True, deep=True).sum())
+            legacy = to_object_schema(compact)
+            del compact
+            object_bytes = int(legacy.memory_usage(index=True, deep=True).sum())
+            del legacy
+            rows.append({
+                'schema': name,
+                'rows': n_rows,
+                'object_MB': object_bytes / 1024 ** 2,
+                'compact_MB': compact_bytes / 1024 ** 2,
+                'ratio': object_bytes / compact_bytes,
+            })
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='object 스키마 대비 compact 스키마 메모리 비교')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(memory_report(args.rows, seed=args.seed).to_string(index=False, float_format='{:,.1f}'.format))
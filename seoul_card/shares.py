@@ -0,0 +1,273 @@
+import bisect
+
+import numpy as np
+import pandas as pd
+
+from seoul_card.aggregate_cube import ROW_COUNT
+from seoul_card.date_features import month_ordinals
+
+SHARE_DIM = '온라인업종'
+
+# 기준월마다 보관하는 비중 급증/급감 후보 수 (대시보드 표시 업종 수 슬라이더 최대값)
+SHIFT_CAPACITY = 20
+
+
+def top_k(values, k, largest=True):
+    # 상위(또는 하위) k개 위치를 값 순서대로 돌려준다.
+    # 전체 정렬 대신 argpartition 으로 k개를 고른 뒤 그 k개만 정렬 (동점은 앞 위치 우선)
+    k = min(k, len(values))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    keys = -values if largest else values
+    if k < len(values):
+        picked = np.sort(np.argpartition(keys, k - 1)[:k])
+    else:
+        picked = np.arange(len(values))
+    return picked[np.argsort(keys[picked], kind='stable')]
+
+
+class ShareTable:
+    # 기준월 × 업종 소비 금액, 월 내 소비 비중(%), 전월 대비 비중 변화(%p)를 배열로 보관한다.
+    # 비중은 그 달의 값에만, 변화량은 바로 앞 달에만 의존하므로
+    # 기준월이 추가/변경되면 그 달과 다음 달 행만 다시 계산한다.
+    # 바로 앞 행이 달력상 전월이 아니면(중간 기준월 누락) 변화량은 NaN 이다.
+
+    def __init__(self, months, categories, amounts, counts, by=SHARE_DIM):
+        self.by = by
+        self.months = list(months)
+        self.categories = list(categories)
+        shape = (len(self.months), len(self.categories))
+        self.amounts = np.asarray(amounts, dtype=np.int64).reshape(shape)
+        self.counts = np.asarray(counts, dtype=np.int64).reshape(shape)
+        self.shares = np.zeros(shape)
+        self.deltas = np.full(shape, np.nan)
+        self.last_refreshed = []
+        self._refresh(range(len(self.months)))
+
+    @classmethod
+    def from_cube(cls, cube, by=SHARE_DIM):
+        amounts, (months, categories) = cube.dense(['기준월', by])
+        counts, _ = cube.dense(['기준월', by], ROW_COUNT)
+        return cls(months, categories, amounts, counts, by=by)
+
+    @classmethod
+    def from_dataset(cls, dataset):
+        # PartitionedDataset.derived('share_table', ShareTable.from_dataset) 용
+        return cls.from_cube(dataset.cube())
+
+    def _refresh(self, rows, delta_rows=()):
+        # rows 행의 비중과, rows 및 바로 다음 행(+ delta_rows)의 전월 대비 변화량만 다시 계산
+        rows = np.unique(np.asarray(list(rows), dtype=np.intp))
+        if len(rows):
+            amounts = self.amounts[rows]
+            totals = amounts.sum(axis=1, keepdims=True)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                self.shares[rows] = np.where(totals > 0, amounts / totals * 100, 0.0)
+
+        delta_rows = np.unique(np.concatenate([rows, rows + 1, np.asarray(list(delta_rows), dtype=np.intp)]))
+        delta_rows = delta_rows[delta_rows < len(self.months)]
+        first = delta_rows == 0
+        self.deltas[delta_rows[first]] = np.nan
+        rest = delta_rows[~first]
+        self.deltas[rest] = self.shares[rest] - self.shares[rest - 1]
+        if len(rest):
+            ordinals = month_ordinals([self.months[i] for i in np.concatenate([rest, rest - 1])])
+            gap = ordinals[:len(rest)] - ordinals[len(rest):] != 1
+            self.deltas[rest[gap]] = np.nan
+        self.last_refreshed = [self.months[i] for i in delta_rows]
+
+    def _add_categories(self, categories):
+        # 새 업종 열은 기존 기준월에서 0원 (비중 0%, 변화량 0%p)
+        extra = len(categories)
+        pad = ((0, 0), (0, extra))
+        self.categories += list(categories)
+        self.amounts = np.pad(self.amounts, pad)
+        self.counts = np.pad(self.counts, pad)
+        self.shares = np.pad(self.shares, pad)
+        self.deltas = np.pad(self.deltas, pad)
+        if len(self.months):
+            self.deltas[0, -extra:] = np.nan
+
+    def _insert_month(self, month):
+        row = bisect.bisect_left(self.months, month)
+        self.months.insert(row, month)
+        self.amounts = np.insert(self.amounts, row, 0, axis=0)
+        self.counts = np.insert(self.counts, row, 0, axis=0)
+        self.shares = np.insert(self.shares, row, 0.0, axis=0)
+        self.deltas = np.insert(self.deltas, row, np.nan, axis=0)
+
+    def _remove_month(self, month):
+        row = self.months.index(month)
+        del self.months[row]
+        self.amounts = np.delete(self.amounts, row, axis=0)
+        self.counts = np.delete(self.counts, row, axis=0)
+        self.shares = np.delete(self.shares, row, axis=0)
+        self.deltas = np.delete(self.deltas, row, axis=0)
+
+    def update(self, cube, months=None):
+        # months 기준월 행을 cube 의 값으로 교체(없으면 추가, cube 에 없으면 삭제)하고
+        # 영향받는 행만 다시 계산한다. 다시 계산된 기준월 목록을 돌려준다.
+        months = list(cube.months if months is None else months)
+        cube = cube.select(months=months)
+        amounts, (cube_months, categories) = cube.dense(['기준월', self.by])
+        counts, _ = cube.dense(['기준월', self.by], ROW_COUNT)
+
+        new_categories = [c for c in categories if c not in self.categories]
+        if new_categories:
+            self._add_categories(new_categories)
+        columns = [self.categories.index(c) for c in categories]
+
+        removed = [m for m in months if m not in cube_months and m in self.months]
+        for month in removed:
+            self._remove_month(month)
+        for i, month in enumerate(cube_months):
+            if month not in self.months:
+                self._insert_month(month)
+            row = self.months.index(month)
+            self.amounts[row] = 0
+            self.counts[row] = 0
+            self.amounts[row, columns] = amounts[i]
+            self.counts[row, columns] = counts[i]
+
+        # 삭제된 기준월의 다음 달은 직전 달이 바뀌었으므로 변화량만 다시 계산
+        successors = [bisect.bisect_right(self.months, m) for m in removed]
+        self._refresh([self.months.index(m) for m in cube_months], successors)
+        return self.last_refreshed
+
+    def on_append(self, dataset, months):
+        # PartitionedDataset.derived() 로 등록되면 append/refresh 때 바뀐 기준월만 받아 갱신
+        self.update(dataset.select(months=months).cube(), months)
+
+    def _rows(self, months):
+        if months is None:
+            return np.arange(len(self.months))
+        index = {m: i for i, m in enumerate(self.months)}
+        return np.array(sorted(index[m] for m in months if m in index), dtype=np.intp)
+
+    def _columns(self, rows):
+        # 선택된 기준월에 데이터가 있는 업종만
+        return np.flatnonzero(self.counts[rows].sum(axis=0) > 0)
+
+    def pivot(self, months=None):
+        # 행: 기준월, 열: 업종, 값: 소비 비중(%) (해당 월에 없는 업종은 0)
+        rows = self._rows(months)
+        columns = self._columns(rows)
+        return pd.DataFrame(
+            self.shares[np.ix_(rows, columns)],
+            index=pd.Index([self.months[i] for i in rows], name='기준월'),
+            columns=pd.Index([self.categories[j] for j in columns], name=self.by),
+        )
+
+    def delta_pivot(self, months=None, within=True):
+        # 전월 대비 소비 비중 변화(%p). within=True 이면 직전 기준월이 선택 범위 밖인 행은 NaN
+        # (선택 구간만 놓고 pivot.diff() 한 것과 같다)
+        rows = self._rows(months)
+        columns = self._columns(rows)
+        deltas = self.deltas[np.ix_(rows, columns)]
+        if within and len(rows):
+            outside = np.ones(len(rows), dtype=bool)
+            outside[1:] = rows[1:] - 1 != rows[:-1]
+            deltas[outside] = np.nan
+        return pd.DataFrame(
+            deltas,
+            index=pd.Index([self.months[i] for i in rows], name='기준월'),
+            columns=pd.Index([self.categories[j] for j in columns], name=self.by),
+        )
+
+    def frame(self, months=None):
+        # 기준월 × 업종 long 형식 (데이터가 있는 조합만): 카드이용금액계, 총소비금액, 소비비중
+        rows = self._rows(months)
+        month_index, category_index = np.nonzero(self.counts[rows] > 0)
+        month_rows = rows[month_index]
+        return pd.DataFrame({
+            '기준월': [self.months[i] for i in month_rows],
+            self.by: [self.categories[j] for j in category_index],
+            '카드이용금액계': self.amounts[month_rows, category_index],
+            '총소비금액': self.amounts[month_rows].sum(axis=1),
+            '소비비중': self.shares[month_rows, category_index],
+        })
+
+
+class ShareShiftDetector:
+    # ShareTable 의 전월 대비 비중 변화로 급증/급감 순위를 만든다.
+    # 기준월마다 급증·급감 후보 capacity 개만 argpartition 으로 뽑아 두고, 기간 순위는
+    # 선택된 기준월의 후보만 모아 다시 argpartition 한다 (기간이 연도를 넘어도 12월→1월 변화 포함).
+    # append/refresh 때는 바뀐 기준월과 그 다음 달의 후보만 다시 뽑는다.
+    # 두 달 모두 소비가 없는 업종(0% → 0%)은 비중 변화로 보지 않는다.
+
+    def __init__(self, share_table, capacity=SHIFT_CAPACITY):
+        self.table = share_table
+        self.capacity = capacity
+        self._candidates = {}
+        self._rebuild(range(len(self.table.months)))
+
+    @classmethod
+    def from_dataset(cls, dataset):
+        # 비중 표를 먼저 구독시켜 두므로 append 알림도 비중 표 → 순위 순서로 전달된다
+        return cls(dataset.derived('share_table', ShareTable.from_dataset))
+
+    def _month_candidates(self, row, k):
+        # row 기준월의 (급증 업종 열, 변화량), (급감 업종 열, 변화량)
+        empty = (np.empty(0, dtype=np.intp), np.empty(0))
+        if row == 0:
+            return empty, empty
+        counts = self.table.counts
+        deltas = self.table.deltas[row]
+        columns = np.flatnonzero(((counts[row] > 0) | (counts[row - 1] > 0)) & ~np.isnan(deltas))
+        values = deltas[columns]
+        increase = top_k(values, k, largest=True)
+        decrease = top_k(values, k, largest=False)
+        return (columns[increase], values[increase]), (columns[decrease], values[decrease])
+
+    def _rebuild(self, rows):
+        for row in rows:
+            if 0 <= row < len(self.table.months):
+                self._candidates[self.table.months[row]] = self._month_candidates(row, self.capacity)
+
+    def on_append(self, dataset, months):
+        # 비중 표가 이미 갱신된 뒤에 호출된다: 바뀐(추가/삭제된) 기준월 자리와 그 다음 달만 다시 뽑는다
+        table_months = self.table.months
+        rows = set()
+        for month in months:
+            row = bisect.bisect_left(table_months, month)
+            rows.add(row)
+            if row < len(table_months) and table_months[row] == month:
+                rows.add(row + 1)
+        present = set(table_months)
+        for month in [m for m in self._candidates if m not in present]:
+            del self._candidates[month]
+        self._rebuild(sorted(rows))
+
+    def rank(self, months=None, n=10, within=True):
+        # 선택 기간의 비중 급증/급감 Top n: ({'업종', '기준월', '비중변화'} 급증 내림차순, 급감 오름차순)
+        # within=True 이면 직전 기준월이 선택 기간 밖인 달(기간의 첫 달 등)은 제외한다
+        rows = self.table._rows(months)
+        if within and len(rows):
+            keep = np.ones(len(rows), dtype=bool)
+            keep[0] = False
+            keep[1:] = rows[1:] - 1 == rows[:-1]
+            rows = rows[keep]
+
+        frames = []
+        for side, largest in ((0, True), (1, False)):
+            columns, values, month_rows = [], [], []
+            for row in rows:
+                if n <= self.capacity:
+                    candidates = self._candidates[self.table.months[row]]
+                else:
+                    candidates = self._month_candidates(row, n)
+                cols, vals = candidates[side]
+                columns.append(cols)
+                values.append(vals)
+                month_rows.append(np.full(len(cols), row, dtype=np.intp))
+            columns = np.concatenate(columns) if columns else np.empty(0, dtype=np.intp)
+            values = np.concatenate(values) if values else np.empty(0)
+            month_rows = np.concatenate(month_rows) if month_rows else np.empty(0, dtype=np.intp)
+
+            picked = top_k(values, n, largest=largest)
+            frames.append(pd.DataFrame({
+                '업종': [self.table.categories[j] for j in columns[picked]],
+                '기준월': [self.table.months[i] for i in month_rows[picked]],
+                '비중변화': values[picked],
+            }))
+        return frames[0], frames[1]